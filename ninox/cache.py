@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+import click
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+CACHE_NAME = "cache.sqlite"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS counters (
+    namespace TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def default_cache_path() -> Path:
+    """Return the shared cache file under ``$XDG_CACHE_HOME`` (``~/.cache``)."""
+    base = os.environ.get("XDG_CACHE_HOME") or "~/.cache"
+    return Path(base).expanduser() / "ninox" / CACHE_NAME
+
+
+class NamespaceStats(BaseModel):
+    """Size and effectiveness of one cache namespace."""
+
+    namespace: str
+    entries: int = 0
+    size: int = 0
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class Cache:
+    """
+    Namespaced string key/value store in one SQLite file shared by every command.
+
+    WAL mode lets several ninox processes use the file at once. Hit and miss
+    counts and access times are buffered in memory and written on ``flush``,
+    so a lookup costs a single indexed read. Expired and least recently used
+    entries beyond ``max_bytes`` are evicted by ``prune``, which runs on close.
+    """
+
+    def __init__(
+        self, path: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.path = path or default_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.counts: Counter[tuple[str, str]] = Counter()
+        self.touched: dict[tuple[str, str], float] = {}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def get(self, namespace: str, key: str) -> str | None:
+        """Return the live value for ``key`` in ``namespace``, if any."""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value, expires FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self.counts[namespace, "misses"] += 1
+                return None
+            self.counts[namespace, "hits"] += 1
+            self.touched[namespace, key] = now
+            return str(row[0])
+
+    def set(
+        self, namespace: str, key: str, value: str, ttl: float | None = None
+    ) -> None:
+        """Store ``value``, expiring after ``ttl`` seconds if given."""
+        now = time.time()
+        expires = None if ttl is None else now + ttl
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, value, len(value.encode()), expires, now),
+            )
+
+    def flush(self) -> None:
+        """Write buffered access times and hit/miss counts."""
+        with self.lock:
+            touched = [(t, ns, key) for (ns, key), t in self.touched.items()]
+            namespaces = {ns for ns, _ in self.counts}
+            counts = [
+                (ns, self.counts[ns, "hits"], self.counts[ns, "misses"])
+                for ns in namespaces
+            ]
+            self.touched.clear()
+            self.counts.clear()
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE entries SET accessed = max(accessed, ?) "
+                    "WHERE namespace = ? AND key = ?",
+                    touched,
+                )
+                self.conn.executemany(
+                    "INSERT INTO counters (namespace, hits, misses) VALUES (?, ?, ?) "
+                    "ON CONFLICT (namespace) DO UPDATE SET "
+                    "hits = hits + excluded.hits, misses = misses + excluded.misses",
+                    counts,
+                )
+
+    def prune(self, max_bytes: int | None = None) -> int:
+        """Evict expired entries, then the least recently used beyond the limit."""
+        self.flush()
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self.lock, self.conn:
+            removed = self.conn.execute(
+                "DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?",
+                (time.time(),),
+            ).rowcount
+            (total,) = self.conn.execute(
+                "SELECT coalesce(sum(size), 0) FROM entries"
+            ).fetchone()
+            if total > limit:
+                removed += self.conn.execute(
+                    "DELETE FROM entries WHERE rowid IN ("
+                    " SELECT rowid FROM ("
+                    "  SELECT rowid,"
+                    "   sum(size) OVER (ORDER BY accessed, rowid) - size AS freed"
+                    "  FROM entries"
+                    " ) WHERE freed < ?"
+                    ")",
+                    (total - limit,),
+                ).rowcount
+        return removed
+
+    def clear(self, namespace: str | None = None) -> int:
+        """Remove every entry and counter, or only those in ``namespace``."""
+        with self.lock, self.conn:
+            self.touched.clear()
+            self.counts.clear()
+            if namespace is None:
+                self.conn.execute("DELETE FROM counters")
+                return self.conn.execute("DELETE FROM entries").rowcount
+            self.conn.execute("DELETE FROM counters WHERE namespace = ?", (namespace,))
+            return self.conn.execute(
+                "DELETE FROM entries WHERE namespace = ?", (namespace,)
+            ).rowcount
+
+    def stats(self) -> list[NamespaceStats]:
+        """Return per-namespace entry counts, sizes and hit/miss totals."""
+        self.flush()
+        stats: dict[str, NamespaceStats] = {}
+        with self.lock:
+            for namespace, entries, size in self.conn.execute(
+                "SELECT namespace, count(*), sum(size) FROM entries GROUP BY namespace"
+            ):
+                stats[namespace] = NamespaceStats(
+                    namespace=namespace, entries=entries, size=size
+                )
+            for namespace, hits, misses in self.conn.execute(
+                "SELECT namespace, hits, misses FROM counters"
+            ):
+                ns = stats.setdefault(namespace, NamespaceStats(namespace=namespace))
+                ns.hits, ns.misses = hits, misses
+        return sorted(stats.values(), key=lambda ns: ns.namespace)
+
+    def close(self) -> None:
+        self.prune()
+        self.conn.close()
+
+
+@click.group()
+def cache() -> None:
+    """Inspect and maintain the shared on-disk cache."""
+
+
+@cache.command()
+def stats() -> None:
+    """Show entries, size and hit rate per namespace."""
+    with Cache() as store:
+        click.echo(f"Cache: {store.path}")
+        rows = store.stats()
+        click.echo(
+            f"{'namespace':<24} {'entries':>8} {'size KiB':>10} "
+            f"{'hits':>8} {'misses':>8} {'hit rate':>9}"
+        )
+        for ns in rows:
+            click.echo(
+                f"{ns.namespace:<24} {ns.entries:>8} {ns.size / 1024:>10.1f} "
+                f"{ns.hits:>8} {ns.misses:>8} {ns.hit_rate:>9.0%}"
+            )
+
+
+@cache.command()
+@click.option(
+    "--max-size",
+    type=click.IntRange(min=0),
+    default=DEFAULT_MAX_BYTES // (1024 * 1024),
+    show_default=True,
+    help="Size limit in MiB; least recently used entries beyond it are evicted.",
+)
+def prune(max_size: int) -> None:
+    """Evict expired entries and shrink the cache to --max-size."""
+    with Cache(max_bytes=max_size * 1024 * 1024) as store:
+        removed = store.prune()
+    click.echo(f"Removed {removed} entries.")
+
+
+@cache.command()
+@click.option("--namespace", help="Only clear this namespace.")
+def clear(namespace: str | None) -> None:
+    """Delete cached entries and counters."""
+    with Cache() as store:
+        removed = store.clear(namespace)
+    click.echo(f"Removed {removed} entries.")
@@ -19,10 +19,21 @@ class TokensConfig(BaseModel):
     openai: OpenAITokens
 
 
+class OpenAIConfig(BaseModel):
+    """Connection settings shared by every OpenAI client."""
+
+    base_url: str | None = None
+    timeout: float = 60.0
+    connect_timeout: float = 5.0
+    max_retries: int = 2
+    proxy: str | None = None
+
+
 class Config(BaseModel):
     """Root configuration model."""
 
     tokens: TokensConfig
+    openai: OpenAIConfig = OpenAIConfig()
 
 
 def load_config(config_path: Path | str) -> Config:
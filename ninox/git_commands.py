@@ -1,73 +1,68 @@
 from __future__ import annotations
 
+import hashlib
 import io
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
 
 import click
 from dulwich import porcelain
+from dulwich.objectspec import parse_commit
 from dulwich.repo import Repo
-from openai import OpenAI
+
+from .cache import Cache
+from .openai_client import openai_client
+from .profiling import span
+from .routing import ModelRouter
 
 if TYPE_CHECKING:
+    from dulwich.objects import Commit
+    from openai import OpenAI
+
     from .config import Config
 
+ANCESTRY_SUFFIX = re.compile(r"~(\d*)$")
+REWORD_MARKER = re.compile(r"^# ninox-reword ([0-9a-f]{40})$")
+SUBJECT_LIMIT = 50
+BODY_LIMIT = 72
+SUGGESTIONS = "commit-suggestions"
 
-@click.group()
-def git() -> None:
-    """Git helper commands."""
 
+def suggestion_key(index_tree: bytes, head_tree: bytes | None, model: str) -> str:
+    """Return the cache key for a suggestion of ``index_tree`` over ``head_tree``."""
+    return hashlib.sha256(
+        b"\0".join((index_tree, head_tree or b"", model.encode()))
+    ).hexdigest()
 
-@git.command()
-@click.option(
-    "--model", default="gpt-4.1-mini", show_default=True, help="OpenAI model to use"
-)
-@click.option(
-    "-a",
-    "--all",
-    "stage_all",
-    is_flag=True,
-    help="Automatically stage tracked changes before committing.",
-)
-@click.option(
-    "-n",
-    "--dry-run",
-    "dry_run",
-    is_flag=True,
-    help="Only print the suggested commit message and do not commit.",
-)
-@click.argument("paths", nargs=-1, type=click.Path())
-@click.pass_obj
-def commit(
-    config: Config, model: str, stage_all: bool, dry_run: bool, paths: tuple[str, ...]
-) -> None:
-    """Generate a commit message with an LLM and commit staged changes."""
-    repo = Repo(str(Path.cwd()))
-
-    if stage_all and paths:
-        raise click.UsageError("Cannot use -a with path arguments")
 
-    if stage_all:
-        tracked = [p.decode() for p in repo.open_index().paths()]  # type: ignore[no-untyped-call]
-        if tracked:
-            repo.stage(tracked)
+def validate_commit_message(message: str) -> str | None:
+    """Return why ``message`` breaks the format rules, or ``None`` if it is fine."""
+    lines = message.splitlines()
+    if not lines or not lines[0].strip():
+        return "empty subject"
+    if len(lines[0]) > SUBJECT_LIMIT:
+        return f"subject longer than {SUBJECT_LIMIT} characters"
+    if lines[0].rstrip().endswith("."):
+        return "subject ends with a period"
+    if len(lines) > 1 and lines[1].strip():
+        return "no blank line after subject"
+    if any(len(line) > BODY_LIMIT for line in lines[2:]):
+        return f"body line longer than {BODY_LIMIT} characters"
+    return None
 
-    if paths:
-        repo.stage(paths)
 
-    index_tree = porcelain.write_tree(repo)  # type: ignore[no-untyped-call]
-    try:
-        head_tree = repo[b"HEAD"].tree
-    except KeyError:
-        head_tree = None
+def tree_patch(repo: Repo, old_tree: bytes | None, new_tree: bytes) -> str:
+    """Return the unified diff between ``old_tree`` and ``new_tree``."""
     diff_io = io.BytesIO()
-    porcelain.diff_tree(repo.path, head_tree, index_tree, outstream=diff_io)
-    patch = diff_io.getvalue().decode()
-    if not patch.strip():
-        click.echo("No staged changes to commit.")
-        raise click.Abort
+    with span("porcelain.diff_tree"):
+        porcelain.diff_tree(repo.path, old_tree, new_tree, outstream=diff_io)
+    return diff_io.getvalue().decode()
+
 
-    client = OpenAI(api_key=config.tokens.openai.open)
+def suggest_commit_message(client: OpenAI, model: str, patch: str) -> str:
+    """Ask ``model`` for a commit message describing ``patch``."""
     response = client.chat.completions.create(
         model=model,
         messages=[
@@ -98,7 +93,172 @@ Return only the formatted commit message—no code fences, no extra prose.""",
         ],
         max_tokens=512,
     )
-    message = cast("str", response.choices[0].message.content).strip()
+    return cast("str", response.choices[0].message.content).strip()
+
+
+def resolve_commit(repo: Repo, spec: str) -> Commit:
+    """Resolve ``spec`` to a commit, following ``~N`` first-parent suffixes."""
+    depth = 0
+    while match := ANCESTRY_SUFFIX.search(spec):
+        depth += int(match.group(1) or 1)
+        spec = spec[: match.start()]
+    try:
+        commit = parse_commit(repo, spec)
+        for _ in range(depth):
+            commit = cast("Commit", repo[commit.parents[0]])
+    except (KeyError, IndexError) as e:
+        raise click.BadParameter(f"Unknown revision: {spec}") from e
+    return commit
+
+
+def commits_in_range(repo: Repo, revision_range: str) -> list[Commit]:
+    """Return the commits in ``BASE..HEAD`` ordered oldest first."""
+    base_spec, sep, tip_spec = revision_range.partition("..")
+    if not sep:
+        tip_spec = "HEAD"
+    base = resolve_commit(repo, base_spec)
+    tip = resolve_commit(repo, tip_spec or "HEAD")
+    if tip.id != repo.head():
+        raise click.BadParameter("Only ranges ending at HEAD can be reworded")
+
+    commits: list[Commit] = []
+    current = tip
+    while current.id != base.id:
+        if len(current.parents) != 1:
+            raise click.BadParameter(
+                f"Cannot reword merge or root commit {current.id.decode()[:12]}"
+            )
+        commits.append(current)
+        current = cast("Commit", repo[current.parents[0]])
+    commits.reverse()
+    return commits
+
+
+def format_reword_buffer(commits: list[Commit], messages: list[str]) -> str:
+    """Build the text shown in the editor when rewording ``commits``."""
+    lines = [
+        "# Edit the messages below. Lines starting with '#' are ignored.",
+        "# Do not modify the '# ninox-reword' marker lines.",
+    ]
+    for commit, message in zip(commits, messages, strict=True):
+        lines.extend(("", f"# ninox-reword {commit.id.decode()}", message))
+    return "\n".join(lines) + "\n"
+
+
+def parse_reword_buffer(text: str) -> dict[bytes, str]:
+    """Split an edited reword buffer into messages keyed by commit id."""
+    messages: dict[bytes, list[str]] = {}
+    current: list[str] | None = None
+    for line in text.splitlines():
+        if match := REWORD_MARKER.match(line):
+            current = messages.setdefault(match.group(1).encode(), [])
+        elif current is not None and not line.startswith("#"):
+            current.append(line)
+    return {sha: "\n".join(lines).strip() for sha, lines in messages.items()}
+
+
+def rewrite_messages(repo: Repo, commits: list[Commit], messages: list[str]) -> bytes:
+    """Recreate ``commits`` with new ``messages`` and move HEAD to the result."""
+    parent = cast("bytes", commits[0].parents[0])
+    for commit, message in zip(commits, messages, strict=True):
+        new = cast("Commit", commit.copy())
+        new.parents = [parent]
+        new.message = message.encode() + b"\n"
+        new.gpgsig = None
+        repo.object_store.add_object(new)
+        parent = new.id
+    repo.refs[b"HEAD"] = parent
+    return parent
+
+
+def stage_changes(repo: Repo, stage_all: bool, paths: tuple[str, ...]) -> None:
+    """Stage every tracked file or just ``paths`` before committing."""
+    if stage_all and paths:
+        raise click.UsageError("Cannot use -a with path arguments")
+
+    if stage_all:
+        tracked = [p.decode() for p in repo.open_index().paths()]  # type: ignore[no-untyped-call]
+        if tracked:
+            repo.stage(tracked)
+
+    if paths:
+        repo.stage(paths)
+
+
+@click.group()
+def git() -> None:
+    """Git helper commands."""
+
+
+@git.command()
+@click.option(
+    "--model", default="gpt-4.1-nano", show_default=True, help="OpenAI model to use"
+)
+@click.option(
+    "--escalate-to",
+    multiple=True,
+    default=["gpt-4.1-mini"],
+    show_default=True,
+    help="Models to retry with, in order, when a suggestion breaks the format "
+    "rules. Pass an empty string to disable.",
+)
+@click.option(
+    "-a",
+    "--all",
+    "stage_all",
+    is_flag=True,
+    help="Automatically stage tracked changes before committing.",
+)
+@click.option(
+    "-n",
+    "--dry-run",
+    "dry_run",
+    is_flag=True,
+    help="Only print the suggested commit message and do not commit.",
+)
+@click.option(
+    "--regenerate",
+    is_flag=True,
+    help="Ignore any cached suggestion for the staged changes.",
+)
+@click.argument("paths", nargs=-1, type=click.Path())
+@click.pass_obj
+def commit(  # noqa: PLR0913, PLR0917
+    config: Config,
+    model: str,
+    stage_all: bool,
+    dry_run: bool,
+    paths: tuple[str, ...],
+    regenerate: bool = False,
+    escalate_to: tuple[str, ...] = (),
+) -> None:
+    """Generate a commit message with an LLM and commit staged changes."""
+    repo = Repo(str(Path.cwd()))
+    stage_changes(repo, stage_all, paths)
+
+    index_tree = porcelain.write_tree(repo)  # type: ignore[no-untyped-call]
+    try:
+        head_tree = repo[b"HEAD"].tree
+    except KeyError:
+        head_tree = None
+    router = ModelRouter([model, *filter(None, escalate_to)])
+    key = suggestion_key(index_tree, head_tree, ">".join(router.models))
+    with Cache() as cache:
+        message = None if regenerate else cache.get(SUGGESTIONS, key)
+        if message is None:
+            patch = tree_patch(repo, head_tree, index_tree)
+            if not patch.strip():
+                click.echo("No staged changes to commit.")
+                raise click.Abort
+
+            client = openai_client(config)
+            message = router.run(
+                lambda m: suggest_commit_message(client, m, patch),
+                validate_commit_message,
+            )
+            cache.set(SUGGESTIONS, key, message)
+            if router.escalated:
+                click.echo(router.summary())
 
     click.echo(f"Suggested commit message:\n{message}")
     if dry_run:
@@ -110,3 +270,98 @@ Return only the formatted commit message—no code fences, no extra prose.""",
 
     porcelain.commit(repo.path, message=message)  # type: ignore[no-untyped-call]
     click.echo("Commit created.")
+
+
+@git.command()
+@click.option(
+    "--model", default="gpt-4.1-nano", show_default=True, help="OpenAI model to use"
+)
+@click.option(
+    "--escalate-to",
+    multiple=True,
+    default=["gpt-4.1-mini"],
+    show_default=True,
+    help="Models to retry with, in order, when a suggestion breaks the format "
+    "rules. Pass an empty string to disable.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of concurrent API requests.",
+)
+@click.option(
+    "-n",
+    "--dry-run",
+    "dry_run",
+    is_flag=True,
+    help="Only print the suggested commit messages and do not rewrite history.",
+)
+@click.option(
+    "--regenerate",
+    is_flag=True,
+    help="Ignore any cached suggestions for the commits in the range.",
+)
+@click.argument("revision_range")
+@click.pass_obj
+def reword(  # noqa: PLR0913, PLR0917
+    config: Config,
+    model: str,
+    jobs: int,
+    dry_run: bool,
+    revision_range: str,
+    regenerate: bool = False,
+    escalate_to: tuple[str, ...] = (),
+) -> None:
+    """Generate new messages for every commit in REVISION_RANGE and rewrite them.
+
+    REVISION_RANGE is either BASE..HEAD or BASE, e.g. ``HEAD~3``.
+    """
+    repo = Repo(str(Path.cwd()))
+    commits = commits_in_range(repo, revision_range)
+    if not commits:
+        click.echo("No commits to reword.")
+        raise click.Abort
+
+    client = openai_client(config, concurrency=jobs)
+    router = ModelRouter([model, *filter(None, escalate_to)])
+    models = ">".join(router.models)
+
+    def suggest(commit: Commit) -> str:
+        parent_tree = cast("Commit", repo[commit.parents[0]]).tree
+        key = suggestion_key(commit.tree, parent_tree, models)
+        message = None if regenerate else cache.get(SUGGESTIONS, key)
+        if message is None:
+            patch = tree_patch(repo, parent_tree, commit.tree)
+            message = router.run(
+                lambda m: suggest_commit_message(client, m, patch),
+                validate_commit_message,
+            )
+            cache.set(SUGGESTIONS, key, message)
+        return message
+
+    with Cache() as cache, ThreadPoolExecutor(max_workers=jobs) as pool:
+        messages = list(pool.map(suggest, commits))
+    if router.inputs:
+        click.echo(router.summary())
+
+    buffer = format_reword_buffer(commits, messages)
+    if dry_run:
+        click.echo(buffer)
+        return
+
+    edited = click.edit(buffer)
+    if edited is not None:
+        parsed = parse_reword_buffer(edited)
+        messages = [
+            parsed.get(commit.id, message)
+            for commit, message in zip(commits, messages, strict=True)
+        ]
+    if not all(messages):
+        click.echo("Empty commit message; aborting.")
+        raise click.Abort
+
+    tip = rewrite_messages(repo, commits, messages)
+    click.echo(f"Reworded {len(commits)} commits; HEAD is now {tip.decode()[:12]}.")
@@ -1,24 +1,107 @@
 from __future__ import annotations
 
 import base64
-import json
+import io
 import mimetypes
 import os
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import click
-from openai import OpenAI
 from openai.types.responses import ResponseInputImageParam, ResponseInputTextParam
 from openai.types.responses.response_input_param import Message
 from PIL import Image
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+from .metadata_store import SidecarStore, open_store, write_sidecar_record
+from .near_duplicates import cluster_near_duplicates
+from .openai_client import openai_client
+from .profiling import timed
+from .routing import ModelRouter
+from .s3_images import (
+    map_bounded,
+    parse_s3_url,
+    pending_s3_images,
+    put_sidecar,
+    s3_client,
+)
+from .token_planner import image_dimensions, plan_images, select_detail
+from .watch import make_watcher
 
 if TYPE_CHECKING:
+    from mypy_boto3_s3 import S3Client
+    from openai import OpenAI
+
     from .config import Config
+    from .metadata_store import MetadataStore, Record
+    from .watch import Watcher
+
+
+SIDECAR_SCHEMA_VERSION = 2
+
+SUPPORTED_EXTS = {".jpg", ".jpeg", ".png", ".webp"}
+
+DEFAULT_MODEL = "gpt-4.1-nano"
+ESCALATION_MODEL = "gpt-4.1-mini"
+
+# Outputs outside these bounds are retried on the next model tier.
+MAX_ALT_TEXT = 250
+MIN_CONFIDENCE = 0.5
+# Bounded so text-heavy images still fit in the output token budget.
+MAX_DETECTED_TEXT = 300
+METADATA_OUTPUT_TOKENS = 1024
+
+# Watch mode retries failed images after this many seconds, doubling each time.
+RETRY_BACKOFF = 5.0
+MAX_RETRY_BACKOFF = 300.0
+
+
+class MetadataError(ValueError):
+    """The model's structured output was cut off, refused or malformed."""
+
+
+class ImageMetadata(BaseModel):
+    """Structured metadata returned for one image."""
+
+    model_config = ConfigDict(extra="forbid")
 
+    alt_text: str
+    caption: str
+    keywords: list[str]
+    detected_text: str
+    confidence: float
 
+
+def image_message(
+    image_path: Path, prompt: str, image_bytes: bytes | None = None
+) -> Message:
+    """Build a Responses API input message carrying ``prompt`` and the image."""
+    img_bytes = image_path.read_bytes() if image_bytes is None else image_bytes
+    mime, _ = mimetypes.guess_type(str(image_path))
+    if mime is None:
+        raise ValueError(f"Cannot determine MIME type for {image_path}")
+    b64 = base64.b64encode(img_bytes).decode("ascii")
+    detail = select_detail(image_dimensions(io.BytesIO(img_bytes)))
+    return Message(
+        role="user",
+        content=[
+            ResponseInputTextParam(type="input_text", text=prompt),
+            ResponseInputImageParam(
+                type="input_image", image_url=f"data:{mime};base64,{b64}", detail=detail
+            ),
+        ],
+    )
+
+
+@timed("get_image_description")
 def get_image_description(
-    client: OpenAI, image_path: Path, context: str, model: str = "gpt-4.1-nano"
+    client: OpenAI,
+    image_path: Path,
+    context: str,
+    model: str = DEFAULT_MODEL,
+    *,
+    image_bytes: bytes | None = None,
 ) -> str:
     """
     Send an image to OpenAI via the Responses API and return its description.
@@ -28,18 +111,14 @@ def get_image_description(
         image_path: Path to the image file.
         context: User-provided context string.
         model: OpenAI model to use.
+        image_bytes: Image content, if already in memory; read from
+            ``image_path`` otherwise.
 
     Returns:
         The text description returned by the model.
 
     AI: Generated by ChatGPT
     """
-    img_bytes = image_path.read_bytes()
-    mime, _ = mimetypes.guess_type(str(image_path))
-    if mime is None:
-        raise ValueError(f"Cannot determine MIME type for {image_path}")
-    b64 = base64.b64encode(img_bytes).decode("ascii")
-
     # Build the prompt and embed the image
     prompt = (
         f"Context: {context}\n\n"
@@ -51,27 +130,88 @@ def get_image_description(
     response = client.responses.create(
         model=model,
         max_output_tokens=256,
-        input=[
-            Message(
-                role="user",
-                content=[
-                    ResponseInputTextParam(type="input_text", text=prompt),
-                    ResponseInputImageParam(
-                        type="input_image",
-                        image_url=f"data:{mime};base64,{b64}",
-                        detail="auto",
-                    ),
-                ],
-            )
-        ],
+        input=[image_message(image_path, prompt, image_bytes)],
     )
     return response.output_text.strip()
 
 
-def write_sidecar(image_path: Path, description: str) -> None:
-    sidecar_data = {"ImageDescription": description}
-    with image_path.with_suffix(f"{image_path.suffix}.meta").open("w") as f:
-        json.dump(sidecar_data, f)
+@timed("get_image_metadata")
+def get_image_metadata(
+    client: OpenAI,
+    image_path: Path,
+    context: str,
+    model: str = DEFAULT_MODEL,
+    *,
+    image_bytes: bytes | None = None,
+) -> ImageMetadata:
+    """
+    Request alt text, caption, keywords and detected text in a single call.
+
+    Args:
+        client: An OpenAI client instance.
+        image_path: Path to the image file.
+        context: User-provided context string.
+        model: OpenAI model to use.
+        image_bytes: Image content, if already in memory; read from
+            ``image_path`` otherwise.
+
+    Returns:
+        The metadata parsed from the model's JSON-schema constrained output.
+
+    Raises:
+        MetadataError: If the response is incomplete or not valid metadata.
+    """
+    prompt = (
+        f"Context: {context}\n\n"
+        f"Filename: {image_path.name}\n\n"
+        "Describe the image given the context and filename. Return alt_text "
+        "(concise, appropriate for image alt text), caption (one sentence), "
+        "keywords (3 to 10 short terms), detected_text (legible text in the "
+        f"image, at most {MAX_DETECTED_TEXT} characters, or an empty string) "
+        "and confidence (0 to 1, how sure you "
+        "are that the alt text is accurate)."
+    )
+
+    response = client.responses.create(
+        model=model,
+        max_output_tokens=METADATA_OUTPUT_TOKENS,
+        input=[image_message(image_path, prompt, image_bytes)],
+        text={
+            "format": {
+                "type": "json_schema",
+                "name": "image_metadata",
+                "schema": ImageMetadata.model_json_schema(),
+                "strict": True,
+            }
+        },
+    )
+    if response.status == "incomplete":
+        details = response.incomplete_details
+        reason = details.reason if details else None
+        raise MetadataError(f"incomplete response ({reason or 'unknown'})")
+    try:
+        return ImageMetadata.model_validate_json(response.output_text)
+    except ValidationError as e:
+        raise MetadataError("invalid structured output") from e
+
+
+def sidecar_record(description: str | ImageMetadata) -> Record:
+    """Build the versioned metadata record stored for one image."""
+    sidecar_data: Record = {"SchemaVersion": SIDECAR_SCHEMA_VERSION}
+    if isinstance(description, ImageMetadata):
+        sidecar_data |= {
+            "ImageDescription": description.alt_text,
+            "Caption": description.caption,
+            "Keywords": description.keywords,
+            "DetectedText": description.detected_text,
+        }
+    else:
+        sidecar_data["ImageDescription"] = description
+    return sidecar_data
+
+
+def write_sidecar(image_path: Path, description: str | ImageMetadata) -> None:
+    write_sidecar_record(image_path, sidecar_record(description))
 
 
 def embed_exif_description(image_path: Path, description: str) -> None:
@@ -95,7 +235,119 @@ def embed_exif_description(image_path: Path, description: str) -> None:
         img.save(image_path, exif=exif_bytes)
 
 
-def process_directory(client: OpenAI, directory: Path, context: str) -> None:
+def find_images(directory: Path) -> list[Path]:
+    """Return every supported image under ``directory`` in path order."""
+    images = [
+        Path(root) / fname
+        for root, _, files in os.walk(directory)
+        for fname in files
+        if Path(fname).suffix.lower() in SUPPORTED_EXTS
+    ]
+    return sorted(images)
+
+
+def description_text(desc: str | ImageMetadata) -> str:
+    return desc.alt_text if isinstance(desc, ImageMetadata) else desc
+
+
+def validate_description(desc: str | ImageMetadata) -> str | None:
+    """Return why ``desc`` should be escalated, or ``None`` if it is usable."""
+    text = description_text(desc).strip()
+    if not text:
+        return "empty description"
+    if len(text) > MAX_ALT_TEXT:
+        return f"description longer than {MAX_ALT_TEXT} characters"
+    if isinstance(desc, ImageMetadata) and desc.confidence < MIN_CONFIDENCE:
+        return "low confidence"
+    return None
+
+
+def describe_image(  # noqa: PLR0913
+    client: OpenAI,
+    image_path: Path,
+    context: str,
+    *,
+    structured: bool = False,
+    image_bytes: bytes | None = None,
+    router: ModelRouter | None = None,
+) -> str | ImageMetadata:
+    """
+    Return plain or structured metadata for one image.
+
+    With a ``router``, the cheapest model is tried first and outputs failing
+    ``validate_description`` or raising ``MetadataError`` are escalated to the
+    next model.
+    """
+
+    def call(model: str) -> str | ImageMetadata:
+        if structured:
+            return get_image_metadata(
+                client, image_path, context, model, image_bytes=image_bytes
+            )
+        return get_image_description(
+            client, image_path, context, model, image_bytes=image_bytes
+        )
+
+    if router is None:
+        return call(DEFAULT_MODEL)
+    return router.run(call, validate_description, retry_on=(MetadataError,))
+
+
+def annotate_image(  # noqa: PLR0913
+    client: OpenAI,
+    img_path: Path,
+    context: str,
+    *,
+    structured: bool = False,
+    store: MetadataStore | None = None,
+    router: ModelRouter | None = None,
+) -> str | ImageMetadata:
+    """Describe one image, record its metadata and return the description."""
+    print(f"Processing {img_path}…")
+    desc = describe_image(
+        client, img_path, context, structured=structured, router=router
+    )
+    print(f"  ✅ Description: {description_text(desc)}")
+    (store or SidecarStore()).write(img_path, sidecar_record(desc))
+    return desc
+
+
+def pending_clusters(
+    directory: Path,
+    store: MetadataStore,
+    dedupe_threshold: int | None = None,
+    *,
+    verbose: bool = True,
+) -> list[list[Path]]:
+    """
+    Return images under ``directory`` still lacking metadata.
+
+    Images are grouped into near-duplicate clusters when ``dedupe_threshold``
+    is set, otherwise each image forms its own cluster.
+    """
+    pending: list[Path] = []
+    for img_path in find_images(directory):
+        if img_path in store:
+            if verbose:
+                print(f"Skipping {img_path}, metadata already exists…")
+            continue
+        pending.append(img_path)
+
+    if dedupe_threshold is None:
+        return [[img_path] for img_path in pending]
+    return cluster_near_duplicates(pending, dedupe_threshold)
+
+
+def process_directory(  # noqa: PLR0913
+    client: OpenAI,
+    directory: Path,
+    context: str,
+    *,
+    structured: bool = False,
+    dedupe_threshold: int | None = None,
+    store: MetadataStore | None = None,
+    router: ModelRouter | None = None,
+) -> None:
     """
     Find all supported images under `directory` and annotate them.
 
@@ -103,38 +355,288 @@ def process_directory(client: OpenAI, directory: Path, context: str) -> None:
         client: An OpenAI client instance.
         directory: Root directory to search.
         context: Context string for all images.
+        structured: Request caption, keywords and detected text as well.
+        dedupe_threshold: If set, describe one image per cluster of perceptual
+            hashes within this Hamming distance and reuse it for the rest.
+        store: Where metadata is recorded; ``.meta`` sidecars by default.
+        router: Model tiers to try, cheapest first; ``DEFAULT_MODEL`` if unset.
 
     AI: Generated by ChatGPT
     """
-    supported_exts = {".jpg", ".jpeg", ".png", ".webp"}
-    for root, _, files in os.walk(directory):
-        for fname in files:
-            if Path(fname).suffix.lower() in supported_exts:
-                img_path = Path(root) / fname
-                if img_path.with_suffix(f"{img_path.suffix}.meta").exists():
-                    print(f"Skipping {img_path}, metadata already exists…")
-                    continue
-                print(f"Processing {img_path}…")
-                try:
-                    desc = get_image_description(client, img_path, context)
-                    print(f"  ✅ Description: {desc}")
-                    write_sidecar(img_path, desc)
-                except Exception as e:
-                    print(f"  ❌ Error on {img_path}: {e}")
-                    raise
+    if store is None:
+        store = SidecarStore()
+    clusters = pending_clusters(directory, store, dedupe_threshold)
+    try:
+        for img_path, *duplicates in clusters:
+            try:
+                desc = annotate_image(
+                    client,
+                    img_path,
+                    context,
+                    structured=structured,
+                    store=store,
+                    router=router,
+                )
+            except MetadataError as e:
+                # Bad output for one image should not abort the whole batch.
+                print(f"  ❌ Skipping {img_path}: {e}")
+                continue
+            except Exception as e:
+                print(f"  ❌ Error on {img_path}: {e}")
+                raise
+            for duplicate in duplicates:
+                print(f"  ♻️ Reusing description for near-duplicate {duplicate}")
+                store.write(duplicate, sidecar_record(desc))
+    finally:
+        store.flush()
+
+
+class DirectoryWatch:
+    """
+    Annotate images as they are written below a directory.
+
+    Images without metadata when the watch starts are queued immediately, and
+    images whose request fails are retried with exponential backoff.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        client: OpenAI,
+        directory: Path,
+        context: str,
+        *,
+        structured: bool = False,
+        debounce: float = 1.0,
+        watcher: Watcher | None = None,
+        store: MetadataStore | None = None,
+        router: ModelRouter | None = None,
+        retry_backoff: float = RETRY_BACKOFF,
+    ) -> None:
+        self.client = client
+        self.context = context
+        self.structured = structured
+        self.router = router
+        self.debounce = debounce
+        self.watcher = watcher or make_watcher(directory, SUPPORTED_EXTS)
+        self.store = store or SidecarStore()
+        self.retry_backoff = retry_backoff
+        # mtimes of images whose metadata is current, so touches are ignored.
+        self.indexed: dict[Path, int] = {}
+        # When each pending path was last seen; failed ones are set in the future.
+        self.pending: dict[Path, float] = {}
+        self.failures: dict[Path, int] = {}
+        # Images dropped while an earlier pass ran produce no event, so queue
+        # everything that has no metadata yet.
+        now = time.monotonic()
+        for path in find_images(directory):
+            if path in self.store:
+                self.indexed[path] = path.stat().st_mtime_ns
+            else:
+                self.pending[path] = now
+
+    def step(self) -> list[Path]:
+        """Wait for changes once and annotate files that have settled."""
+        timeout = None
+        if self.pending:
+            due = min(self.pending.values()) + self.debounce
+            timeout = max(0.0, due - time.monotonic())
+        for path in self.watcher.changes(timeout):
+            self.pending[path] = time.monotonic()
+
+        now = time.monotonic()
+        ready = [p for p, seen in self.pending.items() if now - seen >= self.debounce]
+        annotated: list[Path] = []
+        for img_path in sorted(ready):
+            del self.pending[img_path]
+            try:
+                mtime = img_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if self.indexed.get(img_path) == mtime:
+                continue
+            try:
+                annotate_image(
+                    self.client,
+                    img_path,
+                    self.context,
+                    structured=self.structured,
+                    store=self.store,
+                    router=self.router,
+                )
+            except Exception as e:  # noqa: BLE001
+                failures = self.failures[img_path] = self.failures.get(img_path, 0) + 1
+                delay = min(self.retry_backoff * 2 ** (failures - 1), MAX_RETRY_BACKOFF)
+                print(f"  ❌ Error on {img_path}: {e} (retrying in {delay:.0f}s)")
+                self.pending[img_path] = time.monotonic() + delay
+                continue
+            self.failures.pop(img_path, None)
+            self.indexed[img_path] = mtime
+            annotated.append(img_path)
+        self.store.flush()
+        return annotated
+
+    def run(self) -> None:
+        print("Watching for new images…")
+        try:
+            while True:
+                self.step()
+        except KeyboardInterrupt:
+            print("Stopped watching.")
+        finally:
+            self.watcher.close()
+
+
+def process_s3(  # noqa: PLR0913
+    client: OpenAI,
+    s3: S3Client,
+    url: str,
+    context: str,
+    *,
+    structured: bool = False,
+    jobs: int = 8,
+    router: ModelRouter | None = None,
+) -> None:
+    """
+    Annotate images under an ``s3://bucket/prefix`` URL.
+
+    Objects are downloaded into memory by ``jobs`` concurrent workers and each
+    description is written back as a ``.meta`` sidecar object.
+    """
+    bucket, prefix = parse_s3_url(url)
+
+    def annotate(key: str) -> str | ImageMetadata:
+        body = s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+        desc = describe_image(
+            client,
+            Path(key),
+            context,
+            structured=structured,
+            image_bytes=body,
+            router=router,
+        )
+        put_sidecar(s3, bucket, key, sidecar_record(desc))
+        return desc
+
+    keys = pending_s3_images(s3, bucket, prefix, SUPPORTED_EXTS)
+    for key, future in map_bounded(annotate, keys, jobs):
+        try:
+            desc = future.result()
+        except MetadataError as e:
+            print(f"  ❌ Skipping s3://{bucket}/{key}: {e}")
+            continue
+        except Exception as e:
+            print(f"  ❌ Error on s3://{bucket}/{key}: {e}")
+            raise
+        print(f"Processed s3://{bucket}/{key}")
+        print(f"  ✅ Description: {description_text(desc)}")
+
+
+def print_plan(
+    directory: Path,
+    store_kind: str,
+    dedupe_threshold: int | None,
+    structured: bool,
+    model: str,
+) -> None:
+    # A plan is a dry run, so it must not create or touch the store.
+    store = open_store(directory, store_kind, read_only=True)
+    try:
+        clusters = pending_clusters(directory, store, dedupe_threshold, verbose=False)
+    finally:
+        store.close()
+    representatives = [cluster[0] for cluster in clusters]
+    print(plan_images(representatives, model, structured=structured).summary())
 
 
 @click.command()
-@click.argument("directory", type=Path)
+@click.argument("source")
 @click.option("--context", "-c", help="Context for this batch of images")
+@click.option(
+    "--structured",
+    is_flag=True,
+    help="Also record a caption, keywords and detected text in one request.",
+)
+@click.option(
+    "--dedupe-threshold",
+    type=click.IntRange(0, 64),
+    help="Reuse descriptions for near-duplicate images within this many "
+    "differing perceptual-hash bits (e.g. 6 for burst shots).",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep running and annotate images as they are added or modified.",
+)
+@click.option(
+    "--debounce",
+    default=1.0,
+    show_default=True,
+    help="Seconds a file must stay unchanged before --watch annotates it.",
+)
+@click.option(
+    "--store",
+    "store_kind",
+    type=click.Choice(["sidecar", "sqlite"]),
+    default="sidecar",
+    show_default=True,
+    help="Write .meta sidecars or one consolidated SQLite file per tree.",
+)
+@click.option(
+    "--plan",
+    is_flag=True,
+    help="Print projected requests, tokens, cost and time without calling the API.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    default=8,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Concurrent downloads and requests for s3:// sources.",
+)
+@click.option(
+    "--model", default=DEFAULT_MODEL, show_default=True, help="OpenAI model to use"
+)
+@click.option(
+    "--escalate-to",
+    multiple=True,
+    default=[ESCALATION_MODEL],
+    show_default=True,
+    help="Models to retry with, in order, when a description is empty, too "
+    "long or low confidence. Pass an empty string to disable.",
+)
 @click.pass_obj
-def describe_images(
-    config: Config, directory: Path, context: str | None = None
+def describe_images(  # noqa: PLR0913, PLR0917
+    config: Config,
+    source: str,
+    context: str | None = None,
+    structured: bool = False,
+    dedupe_threshold: int | None = None,
+    watch: bool = False,
+    debounce: float = 1.0,
+    store_kind: str = "sidecar",
+    plan: bool = False,
+    jobs: int = 8,
+    model: str = DEFAULT_MODEL,
+    escalate_to: tuple[str, ...] = (),
 ) -> None:
-    if not directory.is_dir():
+    """Describe images in SOURCE, a local directory or an s3://bucket/prefix URL."""
+    is_s3 = source.startswith("s3://")
+    directory = Path(source)
+    if is_s3:
+        if watch or plan or dedupe_threshold is not None or store_kind != "sidecar":
+            raise click.UsageError(
+                "--watch, --plan, --dedupe-threshold and --store only apply to "
+                "local directories"
+            )
+    elif not directory.is_dir():
         print(f"{directory} is not a directory")
         return
 
+    if plan:
+        print_plan(directory, store_kind, dedupe_threshold, structured, model)
+        return
+
     if context is None:
         context = click.prompt(
             "Enter context for this batch of images:", default=""
@@ -143,11 +645,48 @@ def describe_images(
             print("No context provided; exiting.")
             return
 
-    # Initialize OpenAI client using passed configuration
-    api_key = config.tokens.openai.open
-    client = OpenAI(api_key=api_key)
+    router = ModelRouter([model, *filter(None, escalate_to)])
+    if is_s3:
+        client = openai_client(config, concurrency=jobs)
+        process_s3(
+            client,
+            s3_client(jobs),
+            source,
+            context,
+            structured=structured,
+            jobs=jobs,
+            router=router,
+        )
+        print(router.summary())
+        print("Done.")
+        return
+
+    client = openai_client(config)
+    store = open_store(directory, store_kind)
 
-    process_directory(client, directory, context)
+    try:
+        process_directory(
+            client,
+            directory,
+            context,
+            structured=structured,
+            dedupe_threshold=dedupe_threshold,
+            store=store,
+            router=router,
+        )
+        if watch:
+            DirectoryWatch(
+                client,
+                directory,
+                context,
+                structured=structured,
+                debounce=debounce,
+                store=store,
+                router=router,
+            ).run()
+    finally:
+        store.close()
+    print(router.summary())
     print("Done.")
 
 
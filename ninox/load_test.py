@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import click
+from PIL import Image
+from pydantic import BaseModel
+
+from .git_commands import suggest_commit_message
+from .image_description import get_image_description
+from .mock_openai import MockSettings, running_mock_server
+from .openai_client import openai_client
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from openai import OpenAI
+
+    from .config import Config
+
+WORKLOADS = ("describe-images", "commit")
+
+SAMPLE_PATCH = """diff --git a/file.txt b/file.txt
+--- a/file.txt
++++ b/file.txt
+@@ -1 +1 @@
+-hello
++world
+"""
+
+
+class LoadTestReport(BaseModel):
+    """Results of one load test run."""
+
+    workload: str
+    calls: int
+    failures: int
+    requests: int
+    elapsed: float
+    latencies: list[float]
+
+    @property
+    def retries(self) -> int:
+        return max(self.requests - self.calls, 0)
+
+    @property
+    def throughput(self) -> float:
+        return self.calls / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, pct: int) -> float:
+        """Return the ``pct`` latency percentile in seconds."""
+        if len(self.latencies) < 2:  # noqa: PLR2004
+            return self.latencies[0] if self.latencies else 0.0
+        return statistics.quantiles(self.latencies, n=100)[pct - 1]
+
+    def summary(self) -> str:
+        return "\n".join((
+            f"workload:    {self.workload}",
+            f"calls:       {self.calls} ({self.failures} failed)",
+            f"requests:    {self.requests} ({self.retries} retries)",
+            f"elapsed:     {self.elapsed:.2f}s",
+            f"throughput:  {self.throughput:.1f} calls/s",
+            f"latency p50: {self.percentile(50) * 1000:.0f}ms",
+            f"latency p95: {self.percentile(95) * 1000:.0f}ms",
+            f"latency p99: {self.percentile(99) * 1000:.0f}ms",
+        ))
+
+
+def make_workload(client: OpenAI, workload: str, workdir: Path) -> Callable[[], str]:
+    """Return a callable issuing one request for ``workload``."""
+    if workload == "commit":
+        return lambda: suggest_commit_message(client, "gpt-4.1-mini", SAMPLE_PATCH)
+
+    image_path = workdir / "sample.png"
+    Image.new("RGB", (64, 64), "gray").save(image_path)
+    return lambda: get_image_description(client, image_path, "load test")
+
+
+def run_load_test(
+    config: Config, workload: str, calls: int, concurrency: int, settings: MockSettings
+) -> LoadTestReport:
+    """Drive ``calls`` requests of ``workload`` against a local mock server."""
+    with running_mock_server(settings) as server, tempfile.TemporaryDirectory() as tmp:
+        mock_config = config.model_copy(
+            update={
+                "openai": config.openai.model_copy(update={"base_url": server.base_url})
+            }
+        )
+        client = openai_client(mock_config, concurrency=concurrency)
+        call = make_workload(client, workload, Path(tmp))
+
+        def timed(_: int) -> float | None:
+            start = time.perf_counter()
+            try:
+                call()
+            except Exception:  # noqa: BLE001
+                return None
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(timed, range(calls)))
+        elapsed = time.perf_counter() - start
+
+    latencies = [r for r in results if r is not None]
+    return LoadTestReport(
+        workload=workload,
+        calls=calls,
+        failures=calls - len(latencies),
+        requests=server.stats.requests,
+        elapsed=elapsed,
+        latencies=latencies,
+    )
+
+
+@click.command()
+@click.option(
+    "--workload",
+    type=click.Choice(WORKLOADS),
+    default="describe-images",
+    show_default=True,
+)
+@click.option("--calls", default=100, show_default=True, type=click.IntRange(min=1))
+@click.option("--concurrency", default=8, show_default=True, type=click.IntRange(min=1))
+@click.option("--latency", default=0.2, show_default=True, help="Base delay (s)")
+@click.option("--jitter", default=0.1, show_default=True, help="Random extra delay")
+@click.option("--error-rate", default=0.0, show_default=True, help="Share of 500s")
+@click.option("--rate-limit-rate", default=0.0, show_default=True, help="Share of 429s")
+@click.pass_obj
+def load_test(  # noqa: PLR0913, PLR0917
+    config: Config,
+    workload: str,
+    calls: int,
+    concurrency: int,
+    latency: float,
+    jitter: float,
+    error_rate: float,
+    rate_limit_rate: float,
+) -> None:
+    """Measure a workload against a local mock OpenAI server."""
+    settings = MockSettings(
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+        rate_limit_rate=rate_limit_rate,
+    )
+    report = run_load_test(config, workload, calls, concurrency, settings)
+    click.echo(report.summary())
@@ -1,16 +1,61 @@
+from pathlib import Path
+
 import click
 
-from ninox import git_commands, image_description, s3_hugo
+from ninox import (
+    cache,
+    git_commands,
+    image_description,
+    load_test,
+    metadata_store,
+    mock_openai,
+    s3_hugo,
+)
 from ninox.config import load_config
+from ninox.profiling import DEFAULT_MODE, PROFILE_MODES, Profiler
+
+
+class NinoxGroup(click.Group):
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        # Click would take the subcommand name as the value of a bare
+        # ``--profile``, so give it the default mode explicitly. Arguments
+        # after the subcommand name belong to the subcommand.
+        end = next((i for i, arg in enumerate(args) if arg in self.commands), None)
+        group_args = args[:end]
+        if "--profile" in group_args:
+            i = group_args.index("--profile")
+            if i + 1 == len(args) or args[i + 1] not in PROFILE_MODES:
+                args = [*args[:i], f"--profile={DEFAULT_MODE}", *args[i + 1 :]]
+        return super().parse_args(ctx, args)
 
 
-@click.group()
+@click.group(cls=NinoxGroup)
+@click.option(
+    "--profile",
+    type=click.Choice(PROFILE_MODES),
+    help="Profile the command: cpu (cProfile), mem (tracemalloc) or wall "
+    f"(timing spans only). A bare --profile means {DEFAULT_MODE}.",
+)
+@click.option(
+    "--profile-output",
+    type=Path,
+    help="Where to write the profile report [default: ninox.pstats, "
+    "ninox.tracemalloc or ninox.folded].",
+)
 @click.pass_context
-def cli(ctx: click.Context) -> None:
+def cli(ctx: click.Context, profile: str | None, profile_output: Path | None) -> None:
     """Base command group that loads configuration."""
     ctx.obj = load_config("~/.config/ninox/config.toml")
+    if profile:
+        profiler = Profiler(profile, profile_output)
+        profiler.start()
+        ctx.call_on_close(profiler.stop)
 
 
 cli.add_command(image_description.describe_images)
+cli.add_command(metadata_store.export_sidecars)
 cli.add_command(s3_hugo.generate_menu_tree)
 cli.add_command(git_commands.git)
+cli.add_command(mock_openai.mock_openai)
+cli.add_command(load_test.load_test)
+cli.add_command(cache.cache)
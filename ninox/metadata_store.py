@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol
+
+import click
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+STORE_NAME = ".ninox-metadata.sqlite"
+BATCH_SIZE = 100
+
+Record = dict[str, object]
+
+
+class MetadataStore(Protocol):
+    def __contains__(self, image_path: Path) -> bool: ...
+
+    def write(self, image_path: Path, record: Record) -> None: ...
+
+    def flush(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+def sidecar_path(image_path: Path) -> Path:
+    return image_path.with_suffix(f"{image_path.suffix}.meta")
+
+
+def write_sidecar_record(image_path: Path, record: Record) -> None:
+    with sidecar_path(image_path).open("w") as f:
+        json.dump(record, f)
+
+
+class SidecarStore:
+    """Store each record in a ``.meta`` JSON file next to its image."""
+
+    def __contains__(self, image_path: Path) -> bool:
+        return sidecar_path(image_path).exists()
+
+    def write(self, image_path: Path, record: Record) -> None:  # noqa: PLR6301
+        write_sidecar_record(image_path, record)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteStore:
+    """
+    Store every record for a tree in one SQLite file at its root.
+
+    Paths are stored relative to ``root``. Known paths are held in memory so
+    skip checks never touch the database, and writes are committed in batches.
+    A ``read_only`` store never creates or changes the file; if it does not
+    exist yet, the store is empty.
+    """
+
+    def __init__(
+        self, root: Path, batch_size: int = BATCH_SIZE, *, read_only: bool = False
+    ) -> None:
+        self.root = root
+        self.batch_size = batch_size
+        path = root / STORE_NAME
+        if not read_only:
+            self.conn = sqlite3.connect(path)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        elif path.exists():
+            # Without a live writer's WAL, open as immutable so no -wal or
+            # -shm files are left behind.
+            wal = path.with_name(f"{path.name}-wal").exists()
+            mode = "mode=ro" if wal else "immutable=1"
+            self.conn = sqlite3.connect(f"{path.as_uri()}?{mode}", uri=True)
+        else:
+            self.conn = sqlite3.connect(":memory:")
+        if not read_only or not path.exists():
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS metadata (path TEXT PRIMARY KEY, data TEXT)"
+            )
+        self.known = {row[0] for row in self.conn.execute("SELECT path FROM metadata")}
+        self.pending: list[tuple[str, str]] = []
+
+    def key(self, image_path: Path) -> str:
+        return image_path.relative_to(self.root).as_posix()
+
+    def __contains__(self, image_path: Path) -> bool:
+        return self.key(image_path) in self.known
+
+    def write(self, image_path: Path, record: Record) -> None:
+        key = self.key(image_path)
+        self.known.add(key)
+        self.pending.append((key, json.dumps(record)))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO metadata (path, data) VALUES (?, ?)",
+                self.pending,
+            )
+        self.pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+    def records(self) -> Iterator[tuple[Path, Record]]:
+        """Yield every stored record with its absolute image path."""
+        self.flush()
+        for key, data in self.conn.execute("SELECT path, data FROM metadata"):
+            yield self.root / key, json.loads(data)
+
+
+def open_store(root: Path, kind: str, *, read_only: bool = False) -> MetadataStore:
+    """Return the metadata store named ``kind`` for the tree at ``root``."""
+    if kind == "sqlite":
+        return SQLiteStore(root, read_only=read_only)
+    return SidecarStore()
+
+
+@click.command()
+@click.argument("directory", type=Path)
+@click.option(
+    "--overwrite", is_flag=True, help="Replace sidecar files that already exist."
+)
+def export_sidecars(directory: Path, overwrite: bool) -> None:
+    """Write classic .meta sidecars from a consolidated metadata store."""
+    if not (directory / STORE_NAME).is_file():
+        raise click.ClickException(f"No metadata store found in {directory}")
+
+    store = SQLiteStore(directory)
+    written = skipped = 0
+    try:
+        for image_path, record in store.records():
+            if not overwrite and sidecar_path(image_path).exists():
+                skipped += 1
+                continue
+            write_sidecar_record(image_path, record)
+            written += 1
+    finally:
+        store.close()
+    click.echo(f"Wrote {written} sidecars ({skipped} already present).")
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, override
+
+import click
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+MOCK_TEXT = "A placeholder description from the mock OpenAI server."
+MOCK_COMMIT = "Update files\n\nPlaceholder message from the mock OpenAI server."
+
+
+class MockSettings(BaseModel):
+    """Behaviour knobs for the mock OpenAI server."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    seed: int | None = None
+
+
+class MockStats(BaseModel):
+    """Counters for requests served by the mock OpenAI server."""
+
+    requests: int = 0
+    rate_limited: int = 0
+    errors: int = 0
+
+
+def schema_placeholder(schema: dict[str, Any]) -> object:
+    """Produce a placeholder value satisfying a simple JSON schema."""
+    match schema.get("type"):
+        case "object":
+            return {
+                name: schema_placeholder(prop)
+                for name, prop in schema.get("properties", {}).items()
+            }
+        case "array":
+            return [schema_placeholder(schema.get("items", {}))]
+        case "integer" | "number":
+            return 1
+        case "boolean":
+            return False
+        case _:
+            return MOCK_TEXT
+
+
+def responses_payload(body: dict[str, Any]) -> dict[str, object]:
+    """Build a minimal Responses API body."""
+    text = MOCK_TEXT
+    text_format = body.get("text", {}).get("format", {})
+    if text_format.get("type") == "json_schema":
+        text = json.dumps(schema_placeholder(text_format["schema"]))
+    return {
+        "id": f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": body.get("model", "mock"),
+        "status": "completed",
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "output": [
+            {
+                "type": "message",
+                "id": f"msg_{uuid.uuid4().hex}",
+                "status": "completed",
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "usage": {
+            "input_tokens": 100,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": 12,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": 112,
+        },
+    }
+
+
+def chat_payload(body: dict[str, Any]) -> dict[str, object]:
+    """Build a minimal Chat Completions body."""
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": MOCK_COMMIT},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 12, "total_tokens": 112},
+    }
+
+
+PAYLOADS = {"/v1/responses": responses_payload, "/v1/chat/completions": chat_payload}
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    """Threaded HTTP server imitating the OpenAI endpoints ninox calls."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], settings: MockSettings) -> None:
+        super().__init__(address, MockOpenAIHandler)
+        self.settings = settings
+        self.stats = MockStats()
+        self.lock = threading.Lock()
+        self.random = random.Random(settings.seed)  # noqa: S311
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}/v1"
+
+    def next_outcome(self) -> tuple[HTTPStatus, float]:
+        """Pick the status and delay for the next request and record it."""
+        settings = self.settings
+        with self.lock:
+            self.stats.requests += 1
+            roll = self.random.random()
+            delay = settings.latency + self.random.uniform(0, settings.jitter)
+            if roll < settings.rate_limit_rate:
+                self.stats.rate_limited += 1
+                return HTTPStatus.TOO_MANY_REQUESTS, delay
+            if roll < settings.rate_limit_rate + settings.error_rate:
+                self.stats.errors += 1
+                return HTTPStatus.INTERNAL_SERVER_ERROR, delay
+        return HTTPStatus.OK, delay
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    server: MockOpenAIServer
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        payload = PAYLOADS.get(self.path)
+        if payload is None:
+            self.send_json(HTTPStatus.NOT_FOUND, error_body("Unknown endpoint"))
+            return
+
+        status, delay = self.server.next_outcome()
+        time.sleep(delay)
+        if status == HTTPStatus.TOO_MANY_REQUESTS:
+            self.send_json(
+                status, error_body("Rate limit reached"), {"retry-after-ms": "10"}
+            )
+        elif status == HTTPStatus.INTERNAL_SERVER_ERROR:
+            self.send_json(status, error_body("Injected server error"))
+        else:
+            self.send_json(status, payload(body))
+
+    def send_json(
+        self,
+        status: HTTPStatus,
+        data: dict[str, object],
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        encoded = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    @override
+    def log_message(self, format: str, *args: object) -> None:
+        """Silence per-request logging."""
+
+
+def error_body(message: str) -> dict[str, object]:
+    return {"error": {"message": message, "type": "mock_error", "code": None}}
+
+
+@contextmanager
+def running_mock_server(
+    settings: MockSettings, host: str = "127.0.0.1", port: int = 0
+) -> Generator[MockOpenAIServer]:
+    """Run a mock server on a background thread for the duration of the block."""
+    server = MockOpenAIServer((host, port), settings)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8000, show_default=True, type=int)
+@click.option("--latency", default=0.0, show_default=True, help="Base delay (s)")
+@click.option("--jitter", default=0.0, show_default=True, help="Random extra delay")
+@click.option("--error-rate", default=0.0, show_default=True, help="Share of 500s")
+@click.option("--rate-limit-rate", default=0.0, show_default=True, help="Share of 429s")
+def mock_openai(  # noqa: PLR0913, PLR0917
+    host: str,
+    port: int,
+    latency: float,
+    jitter: float,
+    error_rate: float,
+    rate_limit_rate: float,
+) -> None:
+    """Serve a local stand-in for the OpenAI endpoints ninox uses."""
+    settings = MockSettings(
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+        rate_limit_rate=rate_limit_rate,
+    )
+    server = MockOpenAIServer((host, port), settings)
+    click.echo(f"Mock OpenAI server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        click.echo(server.stats.model_dump_json())
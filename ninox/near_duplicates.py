@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from PIL import Image
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+HASH_SIZE = 8
+
+
+def dhash(image_path: Path, hash_size: int = HASH_SIZE) -> int:
+    """Compute a difference hash comparing horizontally adjacent pixels."""
+    with Image.open(image_path) as img:
+        # Let JPEG decode at a reduced scale; we only need a tiny thumbnail.
+        img.draft("L", (hash_size * 4, hash_size * 4))
+        small = img.convert("L").resize(
+            (hash_size + 1, hash_size), Image.Resampling.LANCZOS
+        )
+        pixels = list(small.getdata())
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            left = pixels[offset + col]
+            right = pixels[offset + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def safe_dhash(image_path: Path) -> int | None:
+    """Return the dHash of ``image_path`` or ``None`` if it cannot be decoded."""
+    try:
+        return dhash(image_path)
+    except OSError:
+        return None
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def hash_images(
+    paths: Sequence[Path], max_workers: int | None = None
+) -> list[int | None]:
+    """Hash ``paths`` in a process pool, preserving order."""
+    if len(paths) < 2:  # noqa: PLR2004
+        return [safe_dhash(p) for p in paths]
+    # forkserver avoids forking a process that may already run client threads.
+    context = multiprocessing.get_context("forkserver")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        return list(pool.map(safe_dhash, paths, chunksize=16))
+
+
+def cluster_near_duplicates(
+    paths: Sequence[Path], threshold: int, max_workers: int | None = None
+) -> list[list[Path]]:
+    """
+    Group ``paths`` whose hashes differ by at most ``threshold`` bits.
+
+    Each cluster starts with its representative, the first path seen. Images
+    that cannot be hashed always form their own cluster.
+    """
+    clusters: list[list[Path]] = []
+    leaders: list[tuple[int, list[Path]]] = []
+    for path, value in zip(paths, hash_images(paths, max_workers), strict=True):
+        if value is None:
+            clusters.append([path])
+            continue
+        for leader, members in leaders:
+            if hamming(leader, value) <= threshold:
+                members.append(path)
+                break
+        else:
+            members = [path]
+            leaders.append((value, members))
+            clusters.append(members)
+    return clusters
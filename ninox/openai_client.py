@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+if TYPE_CHECKING:
+    from .config import Config
+
+# Clients are cached per settings so composed commands share connection pools.
+_clients: dict[tuple[object, ...], OpenAI] = {}
+_async_clients: dict[tuple[object, ...], AsyncOpenAI] = {}
+
+
+def _limits(concurrency: int) -> httpx.Limits:
+    """Size the connection pool so ``concurrency`` requests never queue."""
+    size = max(concurrency, 1)
+    return httpx.Limits(
+        max_connections=size, max_keepalive_connections=size, keepalive_expiry=30.0
+    )
+
+
+def _timeout(config: Config) -> httpx.Timeout:
+    settings = config.openai
+    return httpx.Timeout(settings.timeout, connect=settings.connect_timeout)
+
+
+def _cache_key(config: Config, concurrency: int) -> tuple[object, ...]:
+    settings = config.openai
+    return (
+        config.tokens.openai.open,
+        settings.base_url,
+        settings.timeout,
+        settings.connect_timeout,
+        settings.max_retries,
+        settings.proxy,
+        concurrency,
+    )
+
+
+def openai_client(config: Config, *, concurrency: int = 1) -> OpenAI:
+    """Return a shared synchronous client tuned for ``concurrency`` requests."""
+    key = _cache_key(config, concurrency)
+    if key not in _clients:
+        settings = config.openai
+        _clients[key] = OpenAI(
+            api_key=config.tokens.openai.open,
+            base_url=settings.base_url,
+            max_retries=settings.max_retries,
+            http_client=DefaultHttpxClient(
+                limits=_limits(concurrency),
+                timeout=_timeout(config),
+                proxy=settings.proxy,
+            ),
+        )
+    return _clients[key]
+
+
+def async_openai_client(config: Config, *, concurrency: int = 1) -> AsyncOpenAI:
+    """Return a shared asynchronous client tuned for ``concurrency`` requests."""
+    key = _cache_key(config, concurrency)
+    if key not in _async_clients:
+        settings = config.openai
+        _async_clients[key] = AsyncOpenAI(
+            api_key=config.tokens.openai.open,
+            base_url=settings.base_url,
+            max_retries=settings.max_retries,
+            http_client=DefaultAsyncHttpxClient(
+                limits=_limits(concurrency),
+                timeout=_timeout(config),
+                proxy=settings.proxy,
+            ),
+        )
+    return _async_clients[key]
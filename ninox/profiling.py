@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import cProfile
+import functools
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, TextIO
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+PROFILE_MODES = ("cpu", "mem", "wall")
+DEFAULT_MODE = "cpu"
+# cpu: pstats dump (snakeviz, flameprof); mem: tracemalloc snapshot;
+# wall: folded stacks (flamegraph.pl, speedscope).
+DEFAULT_OUTPUTS = {
+    "cpu": "ninox.pstats",
+    "mem": "ninox.tracemalloc",
+    "wall": "ninox.folded",
+}
+TOP_N = 15
+
+
+class Spans:
+    """
+    Wall-clock totals for named code regions, keyed by their nesting path.
+
+    Recording is off until ``enabled`` is set, so instrumented hot paths only
+    pay for one attribute check in normal runs.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.totals: dict[str, list[float]] = defaultdict(lambda: [0, 0.0])
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def stack(self) -> list[str]:
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack  # type: ignore[no-any-return]
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        stack = self.stack()
+        stack.append(name)
+        path = ";".join(stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            with self.lock:
+                total = self.totals[path]
+                total[0] += 1
+                total[1] += elapsed
+
+    def clear(self) -> None:
+        with self.lock:
+            self.totals.clear()
+
+    def folded(self) -> str:
+        """Return self time per path in folded-stack format (microseconds)."""
+        with self.lock:
+            totals = {path: seconds for path, (_, seconds) in self.totals.items()}
+        self_time = dict(totals)
+        for path, seconds in totals.items():
+            parent, _, _ = path.rpartition(";")
+            if parent in self_time:
+                self_time[parent] -= seconds
+        return "".join(
+            f"{path} {max(round(seconds * 1_000_000), 0)}\n"
+            for path, seconds in sorted(self_time.items())
+        )
+
+    def summary(self, limit: int = TOP_N) -> str:
+        with self.lock:
+            rows = sorted(self.totals.items(), key=lambda item: -item[1][1])[:limit]
+        if not rows:
+            return "No spans recorded."
+        lines = [f"{'span':<50} {'calls':>7} {'total s':>10} {'mean ms':>10}"]
+        lines.extend(
+            f"{path:<50} {calls:>7.0f} {seconds:>10.3f} {seconds / calls * 1000:>10.1f}"
+            for path, (calls, seconds) in rows
+        )
+        return "\n".join(lines)
+
+
+SPANS = Spans()
+span = SPANS.span
+
+
+def timed[**P, R](name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Record every call of the decorated function as span ``name``."""
+
+    def decorate(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+class Profiler:
+    """Profile the rest of the process in one of ``PROFILE_MODES``."""
+
+    def __init__(
+        self, mode: str, output: Path | None = None, stream: TextIO | None = None
+    ) -> None:
+        self.mode = mode
+        self.output = output or Path(DEFAULT_OUTPUTS[mode])
+        self.stream = stream or sys.stderr
+        self.profile: cProfile.Profile | None = None
+
+    def start(self) -> None:
+        SPANS.clear()
+        SPANS.enabled = True
+        if self.mode == "cpu":
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        elif self.mode == "mem":
+            tracemalloc.start(25)
+
+    def stop(self) -> None:
+        """Stop profiling, write the report and print a summary."""
+        SPANS.enabled = False
+        print(f"\nProfile ({self.mode}) written to {self.output}", file=self.stream)
+        if self.profile is not None:
+            self.profile.disable()
+            self.profile.dump_stats(self.output)
+            stats = pstats.Stats(self.profile, stream=self.stream)
+            stats.sort_stats("cumulative").print_stats(TOP_N)
+        elif self.mode == "mem":
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            snapshot.dump(str(self.output))
+            print(f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB", file=self.stream)
+            for stat in snapshot.statistics("lineno")[:TOP_N]:
+                print(stat, file=self.stream)
+        else:
+            self.output.write_text(SPANS.folded())
+        print(SPANS.summary(), file=self.stream, flush=True)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+
+class ModelRouter:
+    """
+    Send each input to the cheapest model first and escalate failures.
+
+    ``models`` are ordered cheapest first. An output rejected by the validator
+    is retried on the next model; the last model's output is always accepted.
+    Counters are shared across threads so one router can serve a worker pool.
+    """
+
+    def __init__(self, models: Sequence[str]) -> None:
+        if not models:
+            raise ValueError("At least one model is required")
+        # Retrying on the same model only doubles the cost.
+        self.models = list(dict.fromkeys(models))
+        self.inputs = 0
+        self.attempts: Counter[str] = Counter()
+        self.escalations: Counter[str] = Counter()
+        self.lock = threading.Lock()
+
+    def run[T](
+        self,
+        call: Callable[[str], T],
+        validate: Callable[[T], str | None],
+        retry_on: tuple[type[Exception], ...] = (),
+    ) -> T:
+        """
+        Return ``call(model)`` from the first model whose output validates.
+
+        Exceptions of the ``retry_on`` types escalate like rejected outputs,
+        except on the last model, where they propagate.
+        """
+        with self.lock:
+            self.inputs += 1
+        for model in self.models[:-1]:
+            try:
+                result = call(model)
+                problem = validate(result)
+            except retry_on as e:
+                problem = str(e) or type(e).__name__
+            with self.lock:
+                self.attempts[model] += 1
+                if problem is not None:
+                    self.escalations[f"{model}: {problem}"] += 1
+            if problem is None:
+                return result
+        with self.lock:
+            self.attempts[self.models[-1]] += 1
+        return call(self.models[-1])
+
+    @property
+    def escalated(self) -> int:
+        return sum(self.escalations.values())
+
+    def summary(self) -> str:
+        rate = self.escalated / self.inputs if self.inputs else 0.0
+        lines = [f"Escalated {self.escalated} of {self.inputs} inputs ({rate:.0%})"]
+        lines.extend(
+            f"  {reason}: {count}" for reason, count in self.escalations.most_common()
+        )
+        return "\n".join(lines)
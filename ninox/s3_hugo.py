@@ -5,11 +5,19 @@ import re
 import tomllib
 from collections import defaultdict
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import boto3
 import click
 from pydantic import BaseModel
 
+from .cache import Cache
+from .link_check import DEFAULT_JOBS, LinkCache, verify_links
+from .profiling import timed
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
 MIN_PARTS = 4
 
 SHIPS = {
@@ -77,8 +85,15 @@ def ensure_section(path: Path, title: str, description: str | None = None) -> No
         index.write_text("\n".join(lines) + "\n")
 
 
-def group_objects(bucket: str, prefix: str) -> dict[tuple[str, dt.date], list[str]]:
-    """Group S3 object keys by ship code and date."""
+@timed("group_objects")
+def group_objects(
+    bucket: str, prefix: str, etags: dict[str, str] | None = None
+) -> dict[tuple[str, dt.date], list[str]]:
+    """
+    Group S3 object keys by ship code and date.
+
+    If ``etags`` is given, it is filled with the ETag of every grouped key.
+    """
     s3 = boto3.client("s3")
     paginator = s3.get_paginator("list_objects_v2")
     groups: dict[tuple[str, dt.date], list[str]] = defaultdict(list)
@@ -93,9 +108,12 @@ def group_objects(bucket: str, prefix: str) -> dict[tuple[str, dt.date], list[st
                 continue
             last_modified = obj["LastModified"].astimezone(dt.UTC).date()
             groups[ship_code, last_modified].append(key)
+            if etags is not None:
+                etags[key] = obj.get("ETag", "")
     return groups
 
 
+@timed("write_year_page")
 def write_year_page(  # noqa: PLR0913
     base: Path,
     ship_code: str,
@@ -104,8 +122,13 @@ def write_year_page(  # noqa: PLR0913
     cdn_host: str,
     *,
     description: str | None = None,
+    dead: Collection[str] = frozenset(),
 ) -> None:
-    """Write an ``index.md`` listing all menus for ``year`` grouped by month."""
+    """
+    Write an ``index.md`` listing all menus for ``year`` grouped by month.
+
+    Links in ``dead`` are struck through and marked unavailable.
+    """
     ship_slug = slug(SHIPS[ship_code])
     year_dir = base / "hal_menus" / ship_slug / f"{year}"
     year_dir.mkdir(parents=True, exist_ok=True)
@@ -134,21 +157,53 @@ def write_year_page(  # noqa: PLR0913
             for key in sorted(month_map[month][date]):
                 url = f"{cdn_host}/{key}"
                 name = strip_md5_prefix(Path(key).name)
-                lines.append(f"- [{name}]({url})")
+                if url in dead:
+                    lines.append(f"- ~~[{name}]({url})~~ (unavailable)")
+                else:
+                    lines.append(f"- [{name}]({url})")
             lines.append("")
         lines.extend(("{{< /details >}}", ""))
 
     (year_dir / "index.md").write_text("\n".join(lines))
 
 
-def create_tree(
+def check_links(
+    etags: dict[str, str],
+    cdn_host: str,
+    *,
+    fail_on_dead: bool = False,
+    jobs: int = DEFAULT_JOBS,
+) -> set[str]:
+    """Verify the CDN link for every key in ``etags`` and return the dead URLs."""
+    urls = {f"{cdn_host}/{key}": etag for key, etag in etags.items()}
+    with Cache() as cache:
+        report = verify_links(urls, LinkCache(cache), jobs)
+    click.echo(report.summary())
+    for url, problem in sorted(report.dead.items()):
+        click.echo(f"  {url}: {problem}", err=True)
+    if report.dead and fail_on_dead:
+        raise click.ClickException(f"{len(report.dead)} dead links; no pages written")
+    return set(report.dead)
+
+
+def create_tree(  # noqa: PLR0913
     bucket: str,
     prefix: str,
     output: Path,
     cdn_host: str,
     config_path: Path | None = None,
+    *,
+    verify: bool = False,
+    fail_on_dead: bool = False,
+    jobs: int = DEFAULT_JOBS,
 ) -> None:
-    groups = group_objects(bucket, prefix)
+    dead: set[str] = set()
+    if verify:
+        etags: dict[str, str] = {}
+        groups = group_objects(bucket, prefix, etags)
+        dead = check_links(etags, cdn_host, fail_on_dead=fail_on_dead, jobs=jobs)
+    else:
+        groups = group_objects(bucket, prefix)
     descriptions: dict[str, str] = {}
     if config_path:
         descriptions = load_ship_config(config_path).ships
@@ -169,7 +224,13 @@ def create_tree(
 
     for (code, year), days in year_groups.items():
         write_year_page(
-            output, code, year, days, cdn_host, description=descriptions.get(code)
+            output,
+            code,
+            year,
+            days,
+            cdn_host,
+            description=descriptions.get(code),
+            dead=dead,
         )
 
 
@@ -185,8 +246,33 @@ def create_tree(
 )
 @click.option("--cdn-host", required=True, help="Base URL for S3 objects")
 @click.option("--config", type=Path, help="TOML config file with ship descriptions")
-def generate_menu_tree(
-    bucket: str, prefix: str, output: Path, cdn_host: str, config: Path | None = None
+@click.option(
+    "--verify-links",
+    is_flag=True,
+    help="HEAD every generated link through the CDN; dead links are struck "
+    "through on the page.",
+)
+@click.option(
+    "--fail-on-dead-links",
+    is_flag=True,
+    help="With --verify-links, abort without writing pages if any link is dead.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=DEFAULT_JOBS,
+    show_default=True,
+    help="Concurrent link checks.",
+)
+def generate_menu_tree(  # noqa: PLR0913, PLR0917
+    bucket: str,
+    prefix: str,
+    output: Path,
+    cdn_host: str,
+    config: Path | None = None,
+    verify_links: bool = False,
+    fail_on_dead_links: bool = False,
+    jobs: int = DEFAULT_JOBS,
 ) -> None:
     """Generate a Hugo content tree from menu PDFs stored in S3."""
     if config is None:
@@ -199,7 +285,16 @@ def generate_menu_tree(
         ):
             raise click.Abort
 
-    create_tree(bucket, prefix, output, cdn_host, config)
+    create_tree(
+        bucket,
+        prefix,
+        output,
+        cdn_host,
+        config,
+        verify=verify_links,
+        fail_on_dead=fail_on_dead_links,
+        jobs=jobs,
+    )
 
 
 if __name__ == "__main__":
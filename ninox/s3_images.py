@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+import boto3
+from botocore.config import Config as BotoConfig
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Iterator
+
+    from mypy_boto3_s3 import S3Client
+
+SIDECAR_SUFFIX = ".meta"
+
+
+def parse_s3_url(url: str) -> tuple[str, str]:
+    """Split ``s3://bucket/prefix`` into bucket and prefix."""
+    parsed = urlparse(url)
+    if parsed.scheme != "s3" or not parsed.netloc:
+        raise ValueError(f"Not an S3 URL: {url}")
+    return parsed.netloc, parsed.path.lstrip("/")
+
+
+def s3_client(max_connections: int) -> S3Client:
+    """Return an S3 client whose pool fits ``max_connections`` workers."""
+    return boto3.client(
+        "s3", config=BotoConfig(max_pool_connections=max(max_connections, 10))
+    )
+
+
+def pending_s3_images(
+    s3: S3Client, bucket: str, prefix: str, suffixes: Collection[str]
+) -> Iterator[str]:
+    """
+    Yield image keys under ``prefix`` that have no ``.meta`` sidecar object.
+
+    S3 lists keys in order, and ``key.meta`` always sorts after ``key``. An
+    image is released once the listing moves past where its sidecar would
+    be, so only a small window of keys is ever held in memory.
+    """
+    waiting: deque[str] = deque()
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            key = obj["Key"]
+            while waiting and waiting[0] + SIDECAR_SUFFIX < key:
+                yield waiting.popleft()
+            if key.endswith(SIDECAR_SUFFIX):
+                image = key.removesuffix(SIDECAR_SUFFIX)
+                if image in waiting:
+                    waiting.remove(image)
+            elif Path(key).suffix.lower() in suffixes:
+                waiting.append(key)
+    yield from waiting
+
+
+def put_sidecar(s3: S3Client, bucket: str, key: str, record: object) -> None:
+    s3.put_object(
+        Bucket=bucket,
+        Key=key + SIDECAR_SUFFIX,
+        Body=json.dumps(record).encode(),
+        ContentType="application/json",
+    )
+
+
+def map_bounded[T](
+    func: Callable[[str], T], keys: Iterator[str], jobs: int
+) -> Iterator[tuple[str, Future[T]]]:
+    """
+    Run ``func`` over ``keys`` with at most ``2 * jobs`` calls outstanding.
+
+    Completed futures are yielded as they finish, so callers see results
+    while the listing is still being consumed and memory stays bounded.
+    """
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        in_flight: dict[Future[T], str] = {}
+        for key in keys:
+            if len(in_flight) >= 2 * jobs:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield in_flight.pop(future), future
+            in_flight[pool.submit(func, key)] = key
+        for future in list(in_flight):
+            yield in_flight.pop(future), future
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import math
+from typing import IO, TYPE_CHECKING, Literal, cast
+
+from PIL import Image, UnidentifiedImageError
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+Detail = Literal["low", "high", "auto"]
+
+# Images that fit in the low-detail canvas lose nothing at low detail.
+LOW_DETAIL_MAX_SIDE = 512
+
+# Tile-billed models: (base tokens, tokens per 512px tile).
+TILE_MODELS = {"gpt-4o": (85, 170), "gpt-4.1": (85, 170), "gpt-4o-mini": (2833, 5667)}
+# Patch-billed models: token multiplier per 32px patch.
+PATCH_MODELS = {"gpt-4.1-mini": 1.62, "gpt-4.1-nano": 2.46, "o4-mini": 1.72}
+PATCH_SIZE = 32
+MAX_PATCHES = 1536
+
+# USD per million (input, output) tokens.
+PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "o4-mini": (1.10, 4.40),
+}
+
+PROMPT_TOKENS = 80
+OUTPUT_TOKENS = {False: 60, True: 200}
+SECONDS_PER_REQUEST = 2.0
+
+
+def image_dimensions(source: Path | IO[bytes]) -> tuple[int, int] | None:
+    """Read an image's size from its header without decoding pixel data."""
+    try:
+        with Image.open(source) as img:
+            return cast("tuple[int, int]", img.size)
+    except (OSError, UnidentifiedImageError):
+        return None
+
+
+def select_detail(size: tuple[int, int] | None) -> Detail:
+    """Pick ``low`` for images small enough that high detail adds nothing."""
+    if size is not None and max(size) <= LOW_DETAIL_MAX_SIDE:
+        return "low"
+    return "auto"
+
+
+def fit_within(width: float, height: float, box: int) -> tuple[float, float]:
+    scale = min(1.0, box / max(width, height))
+    return width * scale, height * scale
+
+
+def tile_tokens(model: str, width: int, height: int, detail: Detail) -> int:
+    base, per_tile = TILE_MODELS.get(model, TILE_MODELS["gpt-4.1"])
+    if detail == "low":
+        return base
+    w, h = fit_within(width, height, 2048)
+    scale = min(1.0, 768 / min(w, h))
+    tiles = math.ceil(w * scale / 512) * math.ceil(h * scale / 512)
+    return base + per_tile * tiles
+
+
+def patch_tokens(model: str, width: int, height: int, detail: Detail) -> int:
+    w, h = float(width), float(height)
+    if detail == "low":
+        w, h = fit_within(w, h, LOW_DETAIL_MAX_SIDE)
+    patches = math.ceil(w / PATCH_SIZE) * math.ceil(h / PATCH_SIZE)
+    if patches > MAX_PATCHES:
+        scale = math.sqrt(PATCH_SIZE * PATCH_SIZE * MAX_PATCHES / (w * h))
+        w, h = w * scale, h * scale
+        # Shrink further so whole patches fit within the cap.
+        scale = min(
+            math.floor(w / PATCH_SIZE) / (w / PATCH_SIZE),
+            math.floor(h / PATCH_SIZE) / (h / PATCH_SIZE),
+        )
+        patches = math.ceil(w * scale / PATCH_SIZE) * math.ceil(h * scale / PATCH_SIZE)
+    return math.ceil(min(patches, MAX_PATCHES) * PATCH_MODELS[model])
+
+
+def estimate_image_tokens(
+    model: str, size: tuple[int, int], detail: Detail = "auto"
+) -> int:
+    """Estimate the input tokens an image costs under ``detail``."""
+    width, height = size
+    if detail == "auto":
+        detail = "high"
+    if model in PATCH_MODELS:
+        return patch_tokens(model, width, height, detail)
+    return tile_tokens(model, width, height, detail)
+
+
+class Plan(BaseModel):
+    """Projected cost of describing a batch of images."""
+
+    model: str
+    requests: int = 0
+    low_detail: int = 0
+    unreadable: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    auto_input_tokens: int = 0
+
+    @property
+    def cost(self) -> float:
+        input_price, output_price = PRICES.get(self.model, (0.0, 0.0))
+        return (
+            self.input_tokens * input_price + self.output_tokens * output_price
+        ) / 1_000_000
+
+    @property
+    def wall_time(self) -> float:
+        return self.requests * SECONDS_PER_REQUEST
+
+    def summary(self) -> str:
+        saved = self.auto_input_tokens - self.input_tokens
+        return "\n".join((
+            f"model:          {self.model}",
+            f"requests:       {self.requests} ({self.low_detail} at low detail)",
+            f"unreadable:     {self.unreadable}",
+            f"input tokens:   {self.input_tokens} ({saved} saved by low detail)",
+            f"output tokens:  ~{self.output_tokens}",
+            f"estimated cost: ${self.cost:.4f}",
+            f"estimated time: ~{self.wall_time:.0f}s",
+        ))
+
+
+def plan_images(paths: Iterable[Path], model: str, *, structured: bool = False) -> Plan:
+    """Estimate requests, tokens, cost and wall time for describing ``paths``."""
+    plan = Plan(model=model)
+    for path in paths:
+        plan.requests += 1
+        plan.input_tokens += PROMPT_TOKENS
+        plan.auto_input_tokens += PROMPT_TOKENS
+        plan.output_tokens += OUTPUT_TOKENS[structured]
+        size = image_dimensions(path)
+        if size is None:
+            plan.unreadable += 1
+            continue
+        detail = select_detail(size)
+        plan.low_detail += detail == "low"
+        plan.input_tokens += estimate_image_tokens(model, size, detail)
+        plan.auto_input_tokens += estimate_image_tokens(model, size, "auto")
+    return plan
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+# IN_CREATE is only watched to pick up new directories; files wait for
+# IN_CLOSE_WRITE so half-copied images are never sent.
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+INOTIFY_EVENT = struct.Struct("iIII")
+READ_SIZE = 64 * 1024
+
+
+class Watcher(Protocol):
+    def changes(self, timeout: float | None) -> set[Path]:
+        """Block up to ``timeout`` seconds and return files written meanwhile."""
+
+    def close(self) -> None: ...
+
+
+def scan(directory: Path, suffixes: Collection[str]) -> dict[Path, tuple[int, int]]:
+    """Return ``(mtime_ns, size)`` for every matching file under ``directory``."""
+    found: dict[Path, tuple[int, int]] = {}
+    for root, _, files in os.walk(directory):
+        for fname in files:
+            if Path(fname).suffix.lower() in suffixes:
+                path = Path(root) / fname
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                found[path] = (st.st_mtime_ns, st.st_size)
+    return found
+
+
+class PollingWatcher:
+    """Portable watcher that rescans the tree every ``interval`` seconds."""
+
+    def __init__(
+        self, directory: Path, suffixes: Collection[str], interval: float = 2.0
+    ) -> None:
+        self.directory = directory
+        self.suffixes = suffixes
+        self.interval = interval
+        self.snapshot = scan(directory, suffixes)
+
+    def changes(self, timeout: float | None) -> set[Path]:
+        # Never sleep past one interval, or a long retry backoff in the
+        # caller would hide new files for that long.
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = scan(self.directory, self.suffixes)
+        changed = {
+            path for path, stat in current.items() if self.snapshot.get(path) != stat
+        }
+        self.snapshot = current
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux watcher that sleeps in the kernel until files are written."""
+
+    def __init__(self, directory: Path, suffixes: Collection[str]) -> None:
+        self.directory = directory
+        self.suffixes = suffixes
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: dict[int, Path] = {}
+        self.watch_tree(directory)
+
+    def watch_tree(self, directory: Path) -> set[Path]:
+        """Watch ``directory`` recursively and return files already inside it."""
+        existing: set[Path] = set()
+        for root, _, files in os.walk(directory):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(root), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"Cannot watch {root}")
+            self.watches[wd] = Path(root)
+            existing.update(
+                Path(root) / f for f in files if Path(f).suffix.lower() in self.suffixes
+            )
+        return existing
+
+    def read_events(self) -> bytes:
+        data = b""
+        while True:
+            try:
+                chunk = os.read(self.fd, READ_SIZE)
+            except BlockingIOError:
+                return data
+            data += chunk
+
+    def changes(self, timeout: float | None) -> set[Path]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed: set[Path] = set()
+        data = self.read_events()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = INOTIFY_EVENT.unpack_from(data, offset)
+            start = offset + INOTIFY_EVENT.size
+            name = data[start : start + length].rstrip(b"\0")
+            offset = start + length
+
+            if mask & IN_Q_OVERFLOW:
+                changed.update(scan(self.directory, self.suffixes))
+                continue
+            parent = self.watches.get(wd)
+            if parent is None or not name:
+                continue
+            path = parent / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                # Files may land in a new directory before its watch exists.
+                changed.update(self.watch_tree(path))
+            elif (
+                mask & (IN_CLOSE_WRITE | IN_MOVED_TO)
+                and path.suffix.lower() in self.suffixes
+            ):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def make_watcher(
+    directory: Path, suffixes: Collection[str], poll_interval: float = 2.0
+) -> Watcher:
+    """Return an inotify watcher where available, otherwise a polling one."""
+    if sys.platform == "linux":
+        try:
+            return InotifyWatcher(directory, suffixes)
+        except (OSError, AttributeError, TypeError):
+            pass
+    return PollingWatcher(directory, suffixes, poll_interval)
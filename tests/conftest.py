@@ -0,0 +1,25 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from ninox.config import Config, OpenAIConfig, OpenAITokens, TokensConfig
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep the shared on-disk cache out of the real home directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def make_config() -> Callable[..., Config]:
+    """Return a factory for configs with a dummy token and given OpenAI settings."""
+
+    def factory(**settings: object) -> Config:
+        return Config(
+            tokens=TokensConfig(openai=OpenAITokens(open="tok", closed="")),
+            openai=OpenAIConfig.model_validate(settings),
+        )
+
+    return factory
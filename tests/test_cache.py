@@ -0,0 +1,82 @@
+# ruff: noqa: S101
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from ninox import cache
+from ninox.cache import Cache
+
+
+@pytest.fixture(name="store")
+def fixture_store(tmp_path: Path) -> Iterator[Cache]:
+    with Cache(tmp_path / "cache.sqlite") as store:
+        yield store
+
+
+def test_get_set_and_counters(store: Cache) -> None:
+    assert store.get("ns", "k") is None
+    store.set("ns", "k", "value")
+    assert store.get("ns", "k") == "value"
+    assert store.get("other", "k") is None
+
+    stats = {ns.namespace: ns for ns in store.stats()}
+    assert stats["ns"].entries == 1
+    assert stats["ns"].size == len("value")
+    assert (stats["ns"].hits, stats["ns"].misses) == (1, 1)
+    assert stats["other"].entries == 0
+    assert stats["ns"].hit_rate == 0.5  # noqa: PLR2004
+
+
+def test_expired_entries_miss_and_are_pruned(store: Cache) -> None:
+    store.set("ns", "old", "x", ttl=-1)
+    store.set("ns", "new", "y", ttl=60)
+    assert store.get("ns", "old") is None
+    assert store.get("ns", "new") == "y"
+    assert store.prune() == 1
+
+
+def test_prune_evicts_least_recently_used(store: Cache) -> None:
+    for key in ("a", "b", "c"):
+        store.set("ns", key, "x" * 10)
+    store.get("ns", "a")
+
+    assert store.prune(max_bytes=20) == 1
+    assert store.get("ns", "b") is None
+    assert store.get("ns", "a") == store.get("ns", "c") == "x" * 10
+
+
+def test_clear_namespace(store: Cache) -> None:
+    store.set("keep", "k", "v")
+    store.set("drop", "k", "v")
+    assert store.clear("drop") == 1
+    assert [ns.namespace for ns in store.stats()] == ["keep"]
+    assert store.clear() == 1
+
+
+def test_shared_between_connections(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite"
+    with Cache(path) as first, Cache(path) as second:
+        first.set("ns", "k", "v")
+        assert second.get("ns", "k") == "v"
+    with Cache(path) as reopened:
+        assert [ns.hits for ns in reopened.stats()] == [1]
+
+
+def test_cache_commands() -> None:
+    with Cache() as store:
+        store.set("ns", "k", "v")
+        store.get("ns", "k")
+
+    runner = CliRunner()
+    result = runner.invoke(cache.cache, ["stats"])
+    assert result.exit_code == 0
+    assert "ns" in result.output
+    assert "100%" in result.output
+
+    result = runner.invoke(cache.cache, ["prune", "--max-size", "0"])
+    assert result.output == "Removed 1 entries.\n"
+
+    result = runner.invoke(cache.cache, ["clear"])
+    assert result.output == "Removed 0 entries.\n"
@@ -67,7 +67,9 @@ def test_commit_creates_commit(tmp_path: Path, monkeypatch: pytest.MonkeyPatch)
     porcelain.add(repo.path, "file.txt")  # type: ignore[no-untyped-call]
 
     monkeypatch.setattr(
-        git_commands, "OpenAI", lambda *_, **__: FakeClient(message="Update file")
+        git_commands,
+        "openai_client",
+        lambda *_, **__: FakeClient(message="Update file"),
     )
     monkeypatch.setattr(click, "edit", lambda msg: msg)
 
@@ -94,7 +96,7 @@ def test_commit_only_paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> N
     Path("b.txt").write_text("new", encoding="utf-8")
 
     monkeypatch.setattr(
-        git_commands, "OpenAI", lambda *_, **__: FakeClient(message="Msg")
+        git_commands, "openai_client", lambda *_, **__: FakeClient(message="Msg")
     )
     monkeypatch.setattr(click, "edit", lambda msg: msg)
 
@@ -125,7 +127,7 @@ def test_commit_all_option(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> N
     Path("a.txt").write_text("new", encoding="utf-8")
 
     monkeypatch.setattr(
-        git_commands, "OpenAI", lambda *_, **__: FakeClient(message="Msg")
+        git_commands, "openai_client", lambda *_, **__: FakeClient(message="Msg")
     )
     monkeypatch.setattr(click, "edit", lambda msg: msg)
 
@@ -150,7 +152,7 @@ def test_commit_dry_run(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None
     porcelain.add(repo.path, "file.txt")  # type: ignore[no-untyped-call]
 
     monkeypatch.setattr(
-        git_commands, "OpenAI", lambda *_, **__: FakeClient(message="Msg")
+        git_commands, "openai_client", lambda *_, **__: FakeClient(message="Msg")
     )
 
     def fail_edit(_msg: str) -> str:
@@ -166,3 +168,203 @@ def test_commit_dry_run(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None
 
     repo = Repo(str(tmp_path))
     assert len(list(repo.get_walker())) == 1
+
+
+def test_commit_reuses_cached_suggestion(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = porcelain.init(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    Path("file.txt").write_text("hello", encoding="utf-8")
+    porcelain.add(repo.path, "file.txt")  # type: ignore[no-untyped-call]
+    porcelain.commit(repo.path, message=b"init")  # type: ignore[no-untyped-call]
+
+    Path("file.txt").write_text("new", encoding="utf-8")
+    porcelain.add(repo.path, "file.txt")  # type: ignore[no-untyped-call]
+
+    calls: list[str] = []
+
+    def fake_openai(*_args: object, **_kwargs: object) -> FakeClient:
+        calls.append("client")
+        return FakeClient(message=f"Msg {len(calls)}")
+
+    monkeypatch.setattr(git_commands, "openai_client", fake_openai)
+    echoed: list[str] = []
+    monkeypatch.setattr(click, "echo", lambda msg: echoed.append(str(msg)))
+
+    callback = git_commands.commit.callback
+    assert callback is not None
+    wrapped = cast("Callable[..., None]", getattr(callback, "__wrapped__", None))
+    assert wrapped is not None
+    wrapped(make_config(), "model", stage_all=False, dry_run=True, paths=())
+    wrapped(make_config(), "model", stage_all=False, dry_run=True, paths=())
+    assert calls == ["client"]
+    assert echoed == ["Suggested commit message:\nMsg 1"] * 2
+
+    wrapped(
+        make_config(), "model", stage_all=False, dry_run=True, paths=(), regenerate=True
+    )
+    assert len(calls) == 2  # noqa: PLR2004
+    assert echoed[-1] == "Suggested commit message:\nMsg 2"
+
+    wrapped(make_config(), "other", stage_all=False, dry_run=True, paths=())
+    assert len(calls) == 3  # noqa: PLR2004
+
+
+class PatchEchoCompletions:
+    @staticmethod
+    def create(**kwargs: object) -> object:
+        messages = cast("list[dict[str, str]]", kwargs["messages"])
+        patch = messages[1]["content"]
+        name = next(n for n in ("a.txt", "b.txt", "c.txt") if n in patch)
+        return FakeCompletions(f"Update {name}").create()
+
+
+class PatchEchoClient:
+    def __init__(self) -> None:
+        self.chat = type("Chat", (), {"completions": PatchEchoCompletions()})()
+
+
+def make_stack(tmp_path: Path) -> Repo:
+    repo = cast("Repo", porcelain.init(tmp_path))
+    Path("base.txt").write_text("base", encoding="utf-8")
+    porcelain.add(repo.path, "base.txt")  # type: ignore[no-untyped-call]
+    porcelain.commit(repo.path, message=b"init")  # type: ignore[no-untyped-call]
+    for name in ("a.txt", "b.txt", "c.txt"):
+        Path(name).write_text(name, encoding="utf-8")
+        porcelain.add(repo.path, name)  # type: ignore[no-untyped-call]
+        porcelain.commit(repo.path, message=b"wip")  # type: ignore[no-untyped-call]
+    return repo
+
+
+def test_reword_rewrites_range(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    repo = make_stack(tmp_path)
+    old_trees = [c.commit.tree for c in repo.get_walker()]
+
+    monkeypatch.setattr(
+        git_commands, "openai_client", lambda *_, **__: PatchEchoClient()
+    )
+    monkeypatch.setattr(click, "edit", lambda text: text)
+
+    callback = git_commands.reword.callback
+    assert callback is not None
+    wrapped = cast("Callable[..., None]", getattr(callback, "__wrapped__", None))
+    assert wrapped is not None
+    wrapped(make_config(), "model", 2, dry_run=False, revision_range="HEAD~2")
+
+    repo = Repo(str(tmp_path))
+    entries = list(repo.get_walker())
+    assert [e.commit.message.decode().strip() for e in entries] == [
+        "Update c.txt",
+        "Update b.txt",
+        "wip",
+        "init",
+    ]
+    assert [e.commit.tree for e in entries] == old_trees
+
+
+def test_reword_uses_edited_messages(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    make_stack(tmp_path)
+
+    monkeypatch.setattr(
+        git_commands, "openai_client", lambda *_, **__: PatchEchoClient()
+    )
+    monkeypatch.setattr(
+        click, "edit", lambda text: text.replace("Update b.txt", "Add b\n\n# note")
+    )
+
+    callback = git_commands.reword.callback
+    assert callback is not None
+    wrapped = cast("Callable[..., None]", getattr(callback, "__wrapped__", None))
+    assert wrapped is not None
+    wrapped(make_config(), "model", 4, dry_run=False, revision_range="HEAD~3..HEAD")
+
+    repo = Repo(str(tmp_path))
+    messages = [e.commit.message.decode().strip() for e in repo.get_walker()]
+    assert messages == ["Update c.txt", "Add b", "Update a.txt", "init"]
+
+
+def test_reword_rejects_range_not_ending_at_head(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    make_stack(tmp_path)
+
+    callback = git_commands.reword.callback
+    assert callback is not None
+    wrapped = cast("Callable[..., None]", getattr(callback, "__wrapped__", None))
+    assert wrapped is not None
+    with pytest.raises(click.BadParameter):
+        wrapped(
+            make_config(), "model", 1, dry_run=True, revision_range="HEAD~2..HEAD~1"
+        )
+
+
+def test_parse_reword_buffer() -> None:
+    sha = "a" * 40
+    text = f"# header\n\n# ninox-reword {sha}\nSubject\n\nBody\n# comment\n"
+    assert git_commands.parse_reword_buffer(text) == {sha.encode(): "Subject\n\nBody"}
+
+
+@pytest.mark.parametrize(
+    ("message", "problem"),
+    [
+        ("Add feature", None),
+        ("Add feature\n\nExplain why.", None),
+        ("", "empty subject"),
+        ("x" * 51, "subject longer than 50 characters"),
+        ("Add feature.", "subject ends with a period"),
+        ("Add feature\nNo gap", "no blank line after subject"),
+        ("Add feature\n\n" + "y" * 73, "body line longer than 72 characters"),
+    ],
+)
+def test_validate_commit_message(message: str, problem: str | None) -> None:
+    assert git_commands.validate_commit_message(message) == problem
+
+
+class ModelEchoCompletions:
+    @staticmethod
+    def create(**kwargs: object) -> object:
+        model = str(kwargs["model"])
+        subject = "A rambling subject line that goes on far too long" * 2
+        message = subject if model == "nano" else f"Update via {model}"
+        return FakeCompletions(message).create()
+
+
+class ModelEchoClient:
+    def __init__(self) -> None:
+        self.chat = type("Chat", (), {"completions": ModelEchoCompletions()})()
+
+
+def test_commit_escalates_invalid_message(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = porcelain.init(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    Path("file.txt").write_text("hello", encoding="utf-8")
+    porcelain.add(repo.path, "file.txt")  # type: ignore[no-untyped-call]
+
+    monkeypatch.setattr(
+        git_commands, "openai_client", lambda *_, **__: ModelEchoClient()
+    )
+    monkeypatch.setattr(click, "edit", lambda msg: msg)
+
+    callback = git_commands.commit.callback
+    assert callback is not None
+    wrapped = cast("Callable[..., None]", getattr(callback, "__wrapped__", None))
+    wrapped(
+        make_config(),
+        "nano",
+        stage_all=False,
+        dry_run=False,
+        paths=(),
+        escalate_to=("mini",),
+    )
+
+    repo = Repo(str(tmp_path))
+    last = repo[repo.head()]
+    assert last.message.decode().strip() == "Update via mini"
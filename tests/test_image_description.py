@@ -0,0 +1,352 @@
+# ruff: noqa: S101
+import json
+import time
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
+from typing import cast
+
+import pytest
+from click.testing import CliRunner
+from openai import OpenAI
+from PIL import Image, ImageDraw
+
+from ninox import image_description, mock_openai
+from ninox.config import Config
+from ninox.metadata_store import STORE_NAME, SQLiteStore
+from ninox.near_duplicates import dhash, hamming
+from ninox.openai_client import openai_client
+from ninox.routing import ModelRouter
+from ninox.watch import PollingWatcher
+
+
+def test_get_image_metadata(tmp_path: Path, make_config: Callable[..., Config]) -> None:
+    image = tmp_path / "img.png"
+    Image.new("RGB", (8, 8)).save(image)
+
+    with mock_openai.running_mock_server(mock_openai.MockSettings()) as server:
+        client = openai_client(make_config(base_url=server.base_url))
+        metadata = image_description.get_image_metadata(client, image, "ctx")
+
+    assert metadata.alt_text == mock_openai.MOCK_TEXT
+    assert metadata.keywords == [mock_openai.MOCK_TEXT]
+    assert server.stats.requests == 1
+
+
+def test_write_sidecar_plain(tmp_path: Path) -> None:
+    image = tmp_path / "img.jpg"
+    image_description.write_sidecar(image, "A cat")
+    data = json.loads((tmp_path / "img.jpg.meta").read_text())
+    assert data == {"SchemaVersion": 2, "ImageDescription": "A cat"}
+
+
+def test_write_sidecar_structured(tmp_path: Path) -> None:
+    image = tmp_path / "img.jpg"
+    metadata = image_description.ImageMetadata(
+        alt_text="A cat",
+        caption="A cat on a mat.",
+        keywords=["cat", "mat"],
+        detected_text="",
+        confidence=0.9,
+    )
+    image_description.write_sidecar(image, metadata)
+    data = json.loads((tmp_path / "img.jpg.meta").read_text())
+    assert data == {
+        "SchemaVersion": 2,
+        "ImageDescription": "A cat",
+        "Caption": "A cat on a mat.",
+        "Keywords": ["cat", "mat"],
+        "DetectedText": "",
+    }
+
+
+def test_process_directory_structured(
+    tmp_path: Path, make_config: Callable[..., Config]
+) -> None:
+    Image.new("RGB", (8, 8)).save(tmp_path / "a.png")
+
+    with mock_openai.running_mock_server(mock_openai.MockSettings()) as server:
+        client = openai_client(make_config(base_url=server.base_url))
+        image_description.process_directory(client, tmp_path, "ctx", structured=True)
+
+    data = json.loads((tmp_path / "a.png.meta").read_text())
+    assert data["Caption"] == mock_openai.MOCK_TEXT
+
+
+def burst_frame(*, dot: bool = False) -> Image.Image:
+    """Return a frame with horizontal structure, optionally slightly changed."""
+    img = Image.linear_gradient("L").rotate(90).resize((64, 64)).convert("RGB")
+    draw = ImageDraw.Draw(img)
+    for x in range(0, 64, 16):
+        draw.rectangle((x, 0, x + 5, 63), fill="black")
+    if dot:
+        draw.ellipse((30, 28, 34, 32), fill="white")
+    return img
+
+
+def test_process_directory_reuses_near_duplicates(
+    tmp_path: Path, make_config: Callable[..., Config]
+) -> None:
+    burst1 = tmp_path / "burst1.png"
+    burst2 = tmp_path / "burst2.png"
+    other = tmp_path / "other.png"
+    burst_frame().save(burst1)
+    burst_frame(dot=True).save(burst2)
+    burst_frame().transpose(Image.Transpose.FLIP_LEFT_RIGHT).save(other)
+    # The burst frames must differ, but by fewer bits than the threshold.
+    assert 0 < hamming(dhash(burst1), dhash(burst2)) <= 4  # noqa: PLR2004
+    assert hamming(dhash(burst1), dhash(other)) > 4  # noqa: PLR2004
+
+    with mock_openai.running_mock_server(mock_openai.MockSettings()) as server:
+        client = openai_client(make_config(base_url=server.base_url))
+        image_description.process_directory(client, tmp_path, "ctx", dedupe_threshold=4)
+
+    assert server.stats.requests == 2  # noqa: PLR2004
+    for name in ("burst1.png", "burst2.png", "other.png"):
+        data = json.loads((tmp_path / f"{name}.meta").read_text())
+        assert data["ImageDescription"] == mock_openai.MOCK_TEXT
+
+
+def test_directory_watch_annotates_new_images(
+    tmp_path: Path, make_config: Callable[..., Config]
+) -> None:
+    Image.new("RGB", (8, 8)).save(tmp_path / "old.png")
+    image_description.write_sidecar(tmp_path / "old.png", "Old")
+    watcher = PollingWatcher(tmp_path, image_description.SUPPORTED_EXTS, interval=0)
+
+    with mock_openai.running_mock_server(mock_openai.MockSettings()) as server:
+        client = openai_client(make_config(base_url=server.base_url))
+        watch = image_description.DirectoryWatch(
+            client, tmp_path, "ctx", debounce=0, watcher=watcher
+        )
+        assert watch.step() == []
+
+        Image.new("RGB", (8, 8)).save(tmp_path / "new.png")
+        assert watch.step() == [tmp_path / "new.png"]
+        assert watch.step() == []
+
+    assert server.stats.requests == 1
+    assert (tmp_path / "new.png.meta").exists()
+    data = json.loads((tmp_path / "old.png.meta").read_text())
+    assert data["ImageDescription"] == "Old"
+
+
+def test_directory_watch_picks_up_images_dropped_during_backlog(
+    tmp_path: Path, make_config: Callable[..., Config]
+) -> None:
+    Image.new("RGB", (8, 8)).save(tmp_path / "a.png")
+    watcher = PollingWatcher(tmp_path, image_description.SUPPORTED_EXTS, interval=0)
+
+    with mock_openai.running_mock_server(mock_openai.MockSettings()) as server:
+        client = openai_client(make_config(base_url=server.base_url))
+        image_description.process_directory(client, tmp_path, "ctx")
+        # Saved after the backlog pass listed the directory, before the watch.
+        Image.new("RGB", (8, 8)).save(tmp_path / "late.png")
+        watch = image_description.DirectoryWatch(
+            client, tmp_path, "ctx", debounce=0, watcher=watcher
+        )
+        assert watch.step() == [tmp_path / "late.png"]
+        assert watch.step() == []
+
+    assert (tmp_path / "late.png.meta").exists()
+
+
+def test_directory_watch_retries_failed_images(
+    tmp_path: Path, make_config: Callable[..., Config]
+) -> None:
+    watcher = PollingWatcher(tmp_path, image_description.SUPPORTED_EXTS, interval=0)
+    settings = mock_openai.MockSettings(error_rate=1.0)
+
+    with mock_openai.running_mock_server(settings) as server:
+        config = make_config(base_url=server.base_url)
+        config.openai.max_retries = 0
+        client = openai_client(config)
+        watch = image_description.DirectoryWatch(
+            client, tmp_path, "ctx", debounce=0, watcher=watcher, retry_backoff=0
+        )
+        Image.new("RGB", (8, 8)).save(tmp_path / "new.png")
+        assert watch.step() == []
+        assert tmp_path / "new.png" in watch.pending
+
+        settings.error_rate = 0.0
+        assert watch.step() == [tmp_path / "new.png"]
+
+    assert server.stats.errors == 1
+    assert not watch.failures
+    assert (tmp_path / "new.png.meta").exists()
+
+
+def test_directory_watch_sees_new_images_while_backing_off(
+    tmp_path: Path, make_config: Callable[..., Config]
+) -> None:
+    watcher = PollingWatcher(tmp_path, image_description.SUPPORTED_EXTS, interval=0)
+    settings = mock_openai.MockSettings(error_rate=1.0)
+
+    with mock_openai.running_mock_server(settings) as server:
+        config = make_config(base_url=server.base_url)
+        config.openai.max_retries = 0
+        client = openai_client(config)
+        watch = image_description.DirectoryWatch(
+            client, tmp_path, "ctx", debounce=0, watcher=watcher, retry_backoff=300
+        )
+        Image.new("RGB", (8, 8)).save(tmp_path / "bad.png")
+        assert watch.step() == []
+
+        settings.error_rate = 0.0
+        Image.new("RGB", (8, 8)).save(tmp_path / "new.png")
+        start = time.monotonic()
+        assert watch.step() == [tmp_path / "new.png"]
+
+    assert time.monotonic() - start < 5  # noqa: PLR2004
+    assert tmp_path / "bad.png" in watch.pending
+
+
+def test_process_directory_sqlite_store(
+    tmp_path: Path, make_config: Callable[..., Config]
+) -> None:
+    Image.new("RGB", (8, 8)).save(tmp_path / "a.png")
+    Image.new("RGB", (8, 8)).save(tmp_path / "b.png")
+
+    with mock_openai.running_mock_server(mock_openai.MockSettings()) as server:
+        client = openai_client(make_config(base_url=server.base_url))
+        store = SQLiteStore(tmp_path)
+        image_description.process_directory(client, tmp_path, "ctx", store=store)
+        image_description.process_directory(client, tmp_path, "ctx", store=store)
+        store.close()
+
+    assert server.stats.requests == 2  # noqa: PLR2004
+    assert not list(tmp_path.glob("*.meta"))
+    assert (tmp_path / STORE_NAME).exists()
+
+
+def test_describe_images_plan(tmp_path: Path) -> None:
+    Image.new("RGB", (64, 64)).save(tmp_path / "a.png")
+    Image.new("RGB", (64, 64)).save(tmp_path / "b.png")
+    image_description.write_sidecar(tmp_path / "b.png", "Done")
+
+    result = CliRunner().invoke(
+        image_description.describe_images, [str(tmp_path), "--plan"], obj=object()
+    )
+
+    assert result.exit_code == 0
+    assert "requests:       1 (1 at low detail)" in result.output
+
+
+def test_describe_images_plan_sqlite_is_read_only(tmp_path: Path) -> None:
+    Image.new("RGB", (64, 64)).save(tmp_path / "a.png")
+    Image.new("RGB", (64, 64)).save(tmp_path / "b.png")
+    args = [str(tmp_path), "--plan", "--store", "sqlite"]
+
+    result = CliRunner().invoke(image_description.describe_images, args, obj=object())
+    assert result.exit_code == 0
+    assert "requests:       2" in result.output
+    assert not list(tmp_path.glob(f"{STORE_NAME}*"))
+
+    store = SQLiteStore(tmp_path)
+    store.write(tmp_path / "b.png", {"ImageDescription": "Done"})
+    store.close()
+    before = (tmp_path / STORE_NAME).stat().st_mtime_ns
+
+    result = CliRunner().invoke(image_description.describe_images, args, obj=object())
+    assert "requests:       1" in result.output
+    assert (tmp_path / STORE_NAME).stat().st_mtime_ns == before
+    assert [p.name for p in tmp_path.glob(f"{STORE_NAME}*")] == [STORE_NAME]
+
+
+def test_validate_description() -> None:
+    metadata = image_description.ImageMetadata(
+        alt_text="A cat", caption="", keywords=[], detected_text="", confidence=0.2
+    )
+    assert image_description.validate_description("A cat") is None
+    assert image_description.validate_description(" ") == "empty description"
+    assert image_description.validate_description("x" * 300) == (
+        "description longer than 250 characters"
+    )
+    assert image_description.validate_description(metadata) == "low confidence"
+
+
+def test_describe_image_routes_through_cheapest_model(
+    tmp_path: Path, make_config: Callable[..., Config]
+) -> None:
+    image = tmp_path / "img.png"
+    Image.new("RGB", (8, 8)).save(image)
+    router = ModelRouter(["nano", "mini"])
+
+    with mock_openai.running_mock_server(mock_openai.MockSettings()) as server:
+        client = openai_client(make_config(base_url=server.base_url))
+        desc = image_description.describe_image(
+            client, image, "ctx", structured=True, router=router
+        )
+
+    assert isinstance(desc, image_description.ImageMetadata)
+    assert router.attempts == {"nano": 1}
+    assert router.escalated == 0
+    assert server.stats.requests == 1
+
+
+class FakeResponses:
+    """Return canned Responses API results per model."""
+
+    def __init__(self, outputs: dict[str, tuple[str, str]]) -> None:
+        self.outputs = outputs
+
+    def create(self, **kwargs: object) -> object:
+        status, text = self.outputs[str(kwargs["model"])]
+        details = SimpleNamespace(reason="max_output_tokens")
+        return SimpleNamespace(
+            status=status,
+            output_text=text,
+            incomplete_details=details if status == "incomplete" else None,
+        )
+
+
+def fake_client(outputs: dict[str, tuple[str, str]]) -> OpenAI:
+    return cast("OpenAI", SimpleNamespace(responses=FakeResponses(outputs)))
+
+
+GOOD_METADATA = image_description.ImageMetadata(
+    alt_text="A cat",
+    caption="A cat.",
+    keywords=["cat"],
+    detected_text="",
+    confidence=0.9,
+).model_dump_json()
+
+
+def test_get_image_metadata_rejects_incomplete_output(tmp_path: Path) -> None:
+    image = tmp_path / "img.png"
+    Image.new("RGB", (8, 8)).save(image)
+
+    client = fake_client({"nano": ("incomplete", '{"alt_text": "A ca')})
+    with pytest.raises(image_description.MetadataError, match="max_output_tokens"):
+        image_description.get_image_metadata(client, image, "ctx", "nano")
+
+    client = fake_client({"nano": ("completed", "")})
+    with pytest.raises(image_description.MetadataError, match="invalid"):
+        image_description.get_image_metadata(client, image, "ctx", "nano")
+
+
+def test_describe_image_escalates_malformed_metadata(tmp_path: Path) -> None:
+    image = tmp_path / "img.png"
+    Image.new("RGB", (8, 8)).save(image)
+    client = fake_client({
+        "nano": ("incomplete", '{"alt_text": "A ca'),
+        "mini": ("completed", GOOD_METADATA),
+    })
+    router = ModelRouter(["nano", "mini"])
+
+    desc = image_description.describe_image(
+        client, image, "ctx", structured=True, router=router
+    )
+
+    assert image_description.description_text(desc) == "A cat"
+    assert router.escalations == {"nano: incomplete response (max_output_tokens)": 1}
+
+
+def test_process_directory_skips_malformed_metadata(tmp_path: Path) -> None:
+    Image.new("RGB", (8, 8)).save(tmp_path / "a.png")
+    client = fake_client({image_description.DEFAULT_MODEL: ("completed", "{")})
+
+    image_description.process_directory(client, tmp_path, "ctx", structured=True)
+
+    assert not (tmp_path / "a.png.meta").exists()
@@ -0,0 +1,133 @@
+# ruff: noqa: S101
+import datetime as dt
+import threading
+from collections.abc import Iterator
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import override
+
+import click
+import pytest
+
+from ninox import link_check, s3_hugo
+from ninox.cache import Cache
+
+
+class CDNHandler(BaseHTTPRequestHandler):
+    server: "CDNServer"
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        self.server.requests.append(("HEAD", self.path))
+        if self.path.startswith("/nohead/"):
+            self.send_response(HTTPStatus.METHOD_NOT_ALLOWED)
+        elif self.path.startswith("/ok/"):
+            self.send_response(HTTPStatus.OK)
+        else:
+            self.send_response(HTTPStatus.NOT_FOUND)
+        self.end_headers()
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.server.requests.append(("GET", self.path))
+        self.send_response(HTTPStatus.PARTIAL_CONTENT)
+        self.send_header("Content-Length", "1")
+        self.end_headers()
+        self.wfile.write(b"x")
+
+    @override
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class CDNServer(ThreadingHTTPServer):
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), CDNHandler)
+        self.requests: list[tuple[str, str]] = []
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+
+@pytest.fixture(name="cdn")
+def fixture_cdn() -> Iterator[CDNServer]:
+    server = CDNServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_verify_links_reports_dead(cdn: CDNServer) -> None:
+    urls = {
+        f"{cdn.base_url}/ok/a.pdf": '"a"',
+        f"{cdn.base_url}/nohead/b.pdf": '"b"',
+        f"{cdn.base_url}/gone/c.pdf": '"c"',
+    }
+    report = link_check.verify_links(urls, jobs=2)
+
+    assert report.checked == 3  # noqa: PLR2004
+    assert report.dead == {f"{cdn.base_url}/gone/c.pdf": "HTTP 404"}
+    assert ("GET", "/nohead/b.pdf") in cdn.requests
+
+
+def test_verify_links_skips_unchanged_etags(cdn: CDNServer, tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite"
+    urls = {f"{cdn.base_url}/ok/a.pdf": '"a"', f"{cdn.base_url}/gone/c.pdf": '"c"'}
+    with Cache(path) as cache:
+        link_check.verify_links(urls, link_check.LinkCache(cache))
+    cdn.requests.clear()
+
+    changed = {**urls, f"{cdn.base_url}/ok/a.pdf": '"a2"'}
+    with Cache(path) as cache:
+        report = link_check.verify_links(urls, link_check.LinkCache(cache))
+        assert report.skipped == 1
+        assert cdn.requests == [("HEAD", "/gone/c.pdf")]
+
+        report = link_check.verify_links(changed, link_check.LinkCache(cache))
+        assert report.skipped == 0
+
+        expired = link_check.LinkCache(cache, ttl=-1)
+        link_check.verify_links(urls, expired)
+        assert link_check.verify_links(urls, expired).skipped == 0
+
+
+def test_verify_links_connection_error() -> None:
+    report = link_check.verify_links({"http://127.0.0.1:9/x.pdf": ""}, timeout=1.0)
+    assert report.dead["http://127.0.0.1:9/x.pdf"].startswith("ConnectError")
+
+
+def test_create_tree_annotates_dead_links(
+    cdn: CDNServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    groups = {("ko", dt.date(2025, 3, 17)): ["ok/a.pdf", "gone/b.pdf"]}
+
+    def fake_group_objects(
+        _bucket: str, _prefix: str, etags: dict[str, str]
+    ) -> dict[tuple[str, dt.date], list[str]]:
+        etags.update({"ok/a.pdf": '"a"', "gone/b.pdf": '"b"'})
+        return groups
+
+    monkeypatch.setattr(s3_hugo, "group_objects", fake_group_objects)
+    s3_hugo.create_tree("b", "content/", tmp_path, cdn.base_url, verify=True)
+
+    page = tmp_path / "hal_menus" / "koningsdam" / "2025" / "index.md"
+    content = page.read_text()
+    assert f"- [a.pdf]({cdn.base_url}/ok/a.pdf)" in content
+    assert f"- ~~[b.pdf]({cdn.base_url}/gone/b.pdf)~~ (unavailable)" in content
+    with Cache() as cache:
+        assert cache.get(link_check.NAMESPACE, f"{cdn.base_url}/ok/a.pdf") == '"a"'
+
+    with pytest.raises(click.ClickException, match="1 dead links"):
+        s3_hugo.create_tree(
+            "b",
+            "content/",
+            tmp_path / "strict",
+            cdn.base_url,
+            verify=True,
+            fail_on_dead=True,
+        )
+    assert not (tmp_path / "strict").exists()
@@ -0,0 +1,63 @@
+# ruff: noqa: S101
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from ninox import metadata_store
+
+
+def test_sqlite_store_batches_and_persists(tmp_path: Path) -> None:
+    image = tmp_path / "sub" / "a.jpg"
+    store = metadata_store.SQLiteStore(tmp_path, batch_size=2)
+    assert image not in store
+
+    store.write(image, {"ImageDescription": "A"})
+    assert image in store
+    assert store.pending
+
+    store.write(tmp_path / "b.jpg", {"ImageDescription": "B"})
+    assert not store.pending
+    store.close()
+
+    reopened = metadata_store.SQLiteStore(tmp_path)
+    assert image in reopened
+    assert dict(reopened.records()) == {
+        image: {"ImageDescription": "A"},
+        tmp_path / "b.jpg": {"ImageDescription": "B"},
+    }
+    reopened.close()
+    assert not (tmp_path / "sub" / "a.jpg.meta").exists()
+
+
+def test_export_sidecars(tmp_path: Path) -> None:
+    store = metadata_store.SQLiteStore(tmp_path)
+    store.write(tmp_path / "a.jpg", {"ImageDescription": "A"})
+    store.write(tmp_path / "b.jpg", {"ImageDescription": "B"})
+    store.close()
+    (tmp_path / "b.jpg.meta").write_text('{"ImageDescription": "Old"}')
+
+    runner = CliRunner()
+    result = runner.invoke(metadata_store.export_sidecars, [str(tmp_path)])
+    assert result.exit_code == 0
+    assert "Wrote 1 sidecars (1 already present)" in result.output
+    assert json.loads((tmp_path / "a.jpg.meta").read_text()) == {
+        "ImageDescription": "A"
+    }
+    assert json.loads((tmp_path / "b.jpg.meta").read_text()) == {
+        "ImageDescription": "Old"
+    }
+
+    result = runner.invoke(
+        metadata_store.export_sidecars, [str(tmp_path), "--overwrite"]
+    )
+    assert result.exit_code == 0
+    assert json.loads((tmp_path / "b.jpg.meta").read_text()) == {
+        "ImageDescription": "B"
+    }
+
+
+def test_export_sidecars_without_store(tmp_path: Path) -> None:
+    result = CliRunner().invoke(metadata_store.export_sidecars, [str(tmp_path)])
+    assert result.exit_code != 0
+    assert "No metadata store found" in result.output
@@ -0,0 +1,59 @@
+# ruff: noqa: S101
+from collections.abc import Callable
+from pathlib import Path
+
+import openai
+import pytest
+from PIL import Image
+
+from ninox import load_test, mock_openai
+from ninox.config import Config
+from ninox.git_commands import suggest_commit_message
+from ninox.image_description import get_image_description
+from ninox.openai_client import openai_client
+
+
+def test_mock_server_serves_both_endpoints(
+    tmp_path: Path, make_config: Callable[..., Config]
+) -> None:
+    image = tmp_path / "img.png"
+    Image.new("RGB", (8, 8)).save(image)
+
+    with mock_openai.running_mock_server(mock_openai.MockSettings()) as server:
+        client = openai_client(make_config(base_url=server.base_url))
+        desc = get_image_description(client, image, "ctx")
+        message = suggest_commit_message(client, "model", "patch")
+
+    assert desc == mock_openai.MOCK_TEXT
+    assert message == mock_openai.MOCK_COMMIT
+    assert server.stats.requests == 2  # noqa: PLR2004
+
+
+def test_mock_server_rate_limits(make_config: Callable[..., Config]) -> None:
+    settings = mock_openai.MockSettings(rate_limit_rate=1.0)
+    with mock_openai.running_mock_server(settings) as server:
+        client = openai_client(make_config(base_url=server.base_url, max_retries=0))
+        with pytest.raises(openai.RateLimitError):
+            suggest_commit_message(client, "model", "patch")
+    assert server.stats.rate_limited == 1
+
+
+def test_run_load_test_reports_retries(make_config: Callable[..., Config]) -> None:
+    settings = mock_openai.MockSettings(rate_limit_rate=0.3, seed=1)
+    report = load_test.run_load_test(
+        make_config(max_retries=5), "commit", 20, 4, settings
+    )
+    assert report.calls == 20  # noqa: PLR2004
+    assert report.failures == 0
+    assert report.retries > 0
+    assert report.requests == report.calls + report.retries
+    assert len(report.latencies) == 20  # noqa: PLR2004
+    assert "throughput" in report.summary()
+
+
+def test_run_load_test_describe_images(make_config: Callable[..., Config]) -> None:
+    report = load_test.run_load_test(
+        make_config(), "describe-images", 5, 2, mock_openai.MockSettings()
+    )
+    assert report.failures == 0
+    assert report.requests == 5  # noqa: PLR2004
@@ -0,0 +1,36 @@
+# ruff: noqa: S101
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from ninox import near_duplicates
+
+
+def make_image(path: Path, *, flip: bool = False, dot: bool = False) -> Path:
+    img = Image.linear_gradient("L").resize((128, 96)).convert("RGB")
+    if flip:
+        img = img.transpose(Image.Transpose.FLIP_TOP_BOTTOM).rotate(90)
+    if dot:
+        ImageDraw.Draw(img).ellipse((60, 40, 64, 44), fill="red")
+    img.save(path)
+    return path
+
+
+def test_dhash_near_duplicates(tmp_path: Path) -> None:
+    a = near_duplicates.dhash(make_image(tmp_path / "a.png"))
+    b = near_duplicates.dhash(make_image(tmp_path / "b.png", dot=True))
+    c = near_duplicates.dhash(make_image(tmp_path / "c.png", flip=True))
+    assert near_duplicates.hamming(a, b) <= 6  # noqa: PLR2004
+    assert near_duplicates.hamming(a, c) > 6  # noqa: PLR2004
+
+
+def test_cluster_near_duplicates(tmp_path: Path) -> None:
+    a = make_image(tmp_path / "a.png")
+    b = make_image(tmp_path / "b.png", dot=True)
+    c = make_image(tmp_path / "c.png", flip=True)
+    broken = tmp_path / "d.png"
+    broken.write_bytes(b"not an image")
+
+    clusters = near_duplicates.cluster_near_duplicates([a, b, c, broken], 6)
+
+    assert clusters == [[a, b], [c], [broken]]
@@ -0,0 +1,32 @@
+# ruff: noqa: S101
+from collections.abc import Callable
+
+import httpx
+
+from ninox import openai_client
+from ninox.config import Config
+
+
+def test_openai_client_uses_settings(make_config: Callable[..., Config]) -> None:
+    config = make_config(
+        base_url="http://localhost:9999/v1", timeout=12.5, max_retries=0
+    )
+    client = openai_client.openai_client(config, concurrency=8)
+    assert str(client.base_url) == "http://localhost:9999/v1/"
+    assert client.max_retries == 0
+    assert client.timeout == httpx.Timeout(12.5, connect=5.0)
+    assert client.api_key == "tok"
+
+
+def test_openai_client_is_shared(make_config: Callable[..., Config]) -> None:
+    config = make_config(base_url="http://localhost:9998/v1")
+    first = openai_client.openai_client(config, concurrency=4)
+    assert openai_client.openai_client(config, concurrency=4) is first
+    assert openai_client.openai_client(config, concurrency=2) is not first
+
+
+def test_async_openai_client_uses_settings(make_config: Callable[..., Config]) -> None:
+    config = make_config(base_url="http://localhost:9997/v1")
+    client = openai_client.async_openai_client(config, concurrency=16)
+    assert str(client.base_url) == "http://localhost:9997/v1/"
+    assert openai_client.async_openai_client(config, concurrency=16) is client
@@ -0,0 +1,111 @@
+# ruff: noqa: S101
+import pstats
+import tracemalloc
+from collections.abc import Iterator
+from pathlib import Path
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from ninox import main, profiling
+
+
+@pytest.fixture
+def spans() -> profiling.Spans:
+    spans = profiling.Spans()
+    spans.enabled = True
+    return spans
+
+
+def test_spans_record_nested_paths(spans: profiling.Spans) -> None:
+    with spans.span("outer"):
+        with spans.span("inner"):
+            pass
+        with spans.span("inner"):
+            pass
+
+    assert set(spans.totals) == {"outer", "outer;inner"}
+    assert spans.totals["outer;inner"][0] == 2  # noqa: PLR2004
+    lines = spans.folded().splitlines()
+    assert [line.split()[0] for line in lines] == ["outer", "outer;inner"]
+    assert "outer;inner" in spans.summary()
+
+
+def test_spans_disabled_records_nothing() -> None:
+    spans = profiling.Spans()
+    with spans.span("outer"):
+        pass
+    assert not spans.totals
+    assert spans.summary() == "No spans recorded."
+
+
+def test_timed_preserves_function() -> None:
+    @profiling.timed("double")
+    def double(x: int) -> int:
+        """Double x."""
+        return x * 2
+
+    assert double(2) == 4  # noqa: PLR2004
+    assert double.__doc__ == "Double x."
+
+
+@pytest.fixture(name="dummy_cli")
+def fixture_dummy_cli(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setattr(main, "load_config", lambda _path: {})
+
+    @click.command()
+    @click.argument("args", nargs=-1)
+    @profiling.timed("dummy.work")
+    def dummy(args: tuple[str, ...]) -> None:
+        sum(range(1000))
+        click.echo(" ".join(args))
+
+    main.cli.add_command(dummy)
+    yield
+    main.cli.commands.pop("dummy", None)
+
+
+@pytest.mark.usefixtures("dummy_cli")
+def test_cli_profile_cpu(tmp_path: Path) -> None:
+    output = tmp_path / "out.pstats"
+    result = CliRunner().invoke(
+        main.cli, ["--profile", "--profile-output", str(output), "dummy"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Profile (cpu)" in result.stderr
+    assert "dummy.work" in result.stderr
+    assert pstats.Stats(str(output)).get_stats_profile().func_profiles
+
+
+@pytest.mark.usefixtures("dummy_cli")
+def test_cli_profile_wall(tmp_path: Path) -> None:
+    output = tmp_path / "out.folded"
+    result = CliRunner().invoke(
+        main.cli, ["--profile=wall", "--profile-output", str(output), "dummy"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert output.read_text().startswith("dummy.work ")
+
+
+@pytest.mark.usefixtures("dummy_cli")
+def test_cli_profile_mem(tmp_path: Path) -> None:
+    output = tmp_path / "out.tracemalloc"
+    result = CliRunner().invoke(
+        main.cli, ["--profile", "mem", "--profile-output", str(output), "dummy"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Peak traced memory" in result.stderr
+    assert tracemalloc.Snapshot.load(str(output)).traces is not None
+
+
+@pytest.mark.usefixtures("dummy_cli")
+def test_cli_profile_after_subcommand_is_passed_through() -> None:
+    result = CliRunner().invoke(main.cli, ["dummy", "--", "--profile"])
+
+    assert result.exit_code == 0, result.output
+    assert result.output == "--profile\n"
+    assert "Profile" not in result.stderr
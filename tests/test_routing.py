@@ -0,0 +1,64 @@
+# ruff: noqa: S101
+import pytest
+
+from ninox.routing import ModelRouter
+
+
+def test_router_returns_first_valid_result() -> None:
+    router = ModelRouter(["cheap", "strong"])
+    calls: list[str] = []
+
+    def call(model: str) -> str:
+        calls.append(model)
+        return f"{model} output"
+
+    assert router.run(call, lambda _: None) == "cheap output"
+    assert calls == ["cheap"]
+    assert router.escalated == 0
+
+
+def test_router_escalates_rejected_outputs() -> None:
+    router = ModelRouter(["cheap", "strong"])
+
+    def validate(result: str) -> str | None:
+        return "too weak" if result == "cheap" else None
+
+    assert router.run(lambda model: model, validate) == "strong"
+    assert router.attempts == {"cheap": 1, "strong": 1}
+    assert router.escalations == {"cheap: too weak": 1}
+    assert "Escalated 1 of 1 inputs (100%)" in router.summary()
+
+
+def test_router_accepts_last_tier_unconditionally() -> None:
+    router = ModelRouter(["only"])
+    assert router.run(lambda model: model, lambda _: "always bad") == "only"
+    assert router.escalated == 0
+
+
+def test_router_requires_a_model() -> None:
+    with pytest.raises(ValueError, match="model"):
+        ModelRouter([])
+
+
+def test_router_escalates_retryable_errors() -> None:
+    router = ModelRouter(["cheap", "strong"])
+
+    def call(model: str) -> str:
+        if model == "cheap":
+            raise ValueError("cut off")
+        return model
+
+    assert router.run(call, lambda _: None, retry_on=(ValueError,)) == "strong"
+    assert router.escalations == {"cheap: cut off": 1}
+
+    with pytest.raises(ValueError, match="cut off"):
+        ModelRouter(["cheap"]).run(call, lambda _: None, retry_on=(ValueError,))
+
+
+def test_router_drops_repeated_models() -> None:
+    router = ModelRouter(["mini", "mini", "strong", "mini"])
+    assert router.models == ["mini", "strong"]
+
+    single = ModelRouter(["mini", "mini"])
+    assert single.run(lambda model: model, lambda _: "bad") == "mini"
+    assert single.attempts == {"mini": 1}
@@ -209,6 +209,7 @@ def test_generate_menu_tree_autoload_config(
         _output: Path,
         _cdn_host: str,
         config_path: Path | None,
+        **_kwargs: object,
     ) -> None:
         captured["config"] = config_path
 
@@ -243,6 +244,7 @@ def test_generate_menu_tree_prompt_continue(
         _output: Path,
         _cdn_host: str,
         config_path: Path | None,
+        **_kwargs: object,
     ) -> None:
         captured["config"] = config_path
 
@@ -0,0 +1,89 @@
+# ruff: noqa: S101
+import io
+import json
+from collections.abc import Callable, Iterator
+
+import pytest
+from PIL import Image
+
+from ninox import image_description, mock_openai, s3_images
+from ninox.config import Config
+from ninox.openai_client import openai_client
+
+
+class FakeS3:
+    def __init__(self, objects: dict[str, bytes], page_size: int = 2) -> None:
+        self.objects = objects
+        self.page_size = page_size
+        self.gets: list[str] = []
+
+    def get_paginator(self, name: str) -> "FakeS3":
+        assert name == "list_objects_v2"
+        return self
+
+    def paginate(self, *, Bucket: str, Prefix: str) -> Iterator[dict[str, object]]:  # noqa: N803
+        assert Bucket == "bucket"
+        keys = sorted(k for k in self.objects if k.startswith(Prefix))
+        for i in range(0, len(keys), self.page_size):
+            yield {"Contents": [{"Key": k} for k in keys[i : i + self.page_size]]}
+
+    def get_object(self, *, Bucket: str, Key: str) -> dict[str, object]:  # noqa: N803
+        assert Bucket == "bucket"
+        self.gets.append(Key)
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def put_object(self, *, Bucket: str, Key: str, Body: bytes, **_: object) -> None:  # noqa: N803
+        assert Bucket == "bucket"
+        self.objects[Key] = Body
+
+
+def png() -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(out, format="PNG")
+    return out.getvalue()
+
+
+def test_parse_s3_url() -> None:
+    assert s3_images.parse_s3_url("s3://bucket/a/b/") == ("bucket", "a/b/")
+    assert s3_images.parse_s3_url("s3://bucket") == ("bucket", "")
+    with pytest.raises(ValueError, match="Not an S3 URL"):
+        s3_images.parse_s3_url("/local/path")
+
+
+def test_pending_s3_images_skips_sidecars() -> None:
+    s3 = FakeS3({
+        "img/a.jpg": b"",
+        "img/a.jpg-copy.jpg": b"",
+        "img/a.jpg.meta": b"",
+        "img/b.png": b"",
+        "img/c.txt": b"",
+        "img/d.webp": b"",
+        "img/d.webp.meta": b"",
+        "img/e.jpg": b"",
+    })
+    keys = s3_images.pending_s3_images(s3, "bucket", "img/", {".jpg", ".png", ".webp"})  # type: ignore[arg-type]
+    assert list(keys) == ["img/a.jpg-copy.jpg", "img/b.png", "img/e.jpg"]
+
+
+def test_process_s3(
+    capsys: pytest.CaptureFixture[str], make_config: Callable[..., Config]
+) -> None:
+    s3 = FakeS3({
+        "img/a.png": png(),
+        "img/b.png": png(),
+        "img/b.png.meta": b"{}",
+        "img/c.png": png(),
+    })
+    config = make_config()
+
+    with mock_openai.running_mock_server(mock_openai.MockSettings()) as server:
+        config.openai.base_url = server.base_url
+        client = openai_client(config, concurrency=2)
+        image_description.process_s3(client, s3, "s3://bucket/img/", "ctx", jobs=2)  # type: ignore[arg-type]
+
+    assert sorted(s3.gets) == ["img/a.png", "img/c.png"]
+    assert server.stats.requests == 2  # noqa: PLR2004
+    record = json.loads(s3.objects["img/a.png.meta"])
+    assert record["ImageDescription"] == mock_openai.MOCK_TEXT
+    assert s3.objects["img/b.png.meta"] == b"{}"
+    assert "Processed s3://bucket/img/c.png" in capsys.readouterr().out
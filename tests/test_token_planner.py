@@ -0,0 +1,58 @@
+# ruff: noqa: S101, PLR2004
+from pathlib import Path
+
+from PIL import Image
+
+from ninox import token_planner
+
+
+def test_image_dimensions(tmp_path: Path) -> None:
+    image = tmp_path / "a.jpg"
+    Image.new("RGB", (640, 480)).save(image)
+    broken = tmp_path / "b.jpg"
+    broken.write_bytes(b"nope")
+    assert token_planner.image_dimensions(image) == (640, 480)
+    assert token_planner.image_dimensions(broken) is None
+
+
+def test_select_detail() -> None:
+    assert token_planner.select_detail((512, 300)) == "low"
+    assert token_planner.select_detail((513, 300)) == "auto"
+    assert token_planner.select_detail(None) == "auto"
+
+
+def test_estimate_image_tokens_tiles() -> None:
+    assert token_planner.estimate_image_tokens("gpt-4o", (1024, 1024), "low") == 85
+    # 1024x1024 scales to 768x768: four tiles.
+    assert token_planner.estimate_image_tokens("gpt-4o", (1024, 1024)) == 765
+    # 2048x4096 scales to 768x1536: six tiles.
+    assert token_planner.estimate_image_tokens("gpt-4.1", (2048, 4096)) == 1105
+
+
+def test_estimate_image_tokens_patches() -> None:
+    # 1024x1024 is 32x32 = 1024 patches.
+    assert token_planner.estimate_image_tokens("gpt-4.1-mini", (1024, 1024)) == 1659
+    # Large images are capped at 1536 patches.
+    tokens = token_planner.estimate_image_tokens("gpt-4.1-nano", (4000, 3000))
+    assert tokens <= 1536 * 2.46
+    low = token_planner.estimate_image_tokens("gpt-4.1-nano", (4000, 3000), "low")
+    assert low < tokens
+
+
+def test_plan_images(tmp_path: Path) -> None:
+    small = tmp_path / "small.png"
+    large = tmp_path / "large.png"
+    Image.new("RGB", (256, 256)).save(small)
+    Image.new("RGB", (2048, 1536)).save(large)
+
+    plan = token_planner.plan_images([small, large], "gpt-4.1-nano")
+
+    assert plan.requests == 2
+    assert plan.low_detail == 1
+    assert plan.input_tokens == (
+        2 * token_planner.PROMPT_TOKENS
+        + token_planner.estimate_image_tokens("gpt-4.1-nano", (256, 256), "low")
+        + token_planner.estimate_image_tokens("gpt-4.1-nano", (2048, 1536))
+    )
+    assert plan.cost > 0
+    assert "estimated cost" in plan.summary()
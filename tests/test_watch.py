@@ -0,0 +1,46 @@
+# ruff: noqa: S101
+import sys
+from pathlib import Path
+
+import pytest
+
+from ninox import watch
+
+SUFFIXES = {".png"}
+
+
+def test_polling_watcher_reports_new_and_modified(tmp_path: Path) -> None:
+    existing = tmp_path / "a.png"
+    existing.write_bytes(b"a")
+    watcher = watch.PollingWatcher(tmp_path, SUFFIXES, interval=0)
+
+    assert watcher.changes(0) == set()
+
+    new = tmp_path / "sub" / "b.png"
+    new.parent.mkdir()
+    new.write_bytes(b"b")
+    (tmp_path / "notes.txt").write_text("ignored")
+    existing.write_bytes(b"changed")
+
+    assert watcher.changes(0) == {existing, new}
+    assert watcher.changes(0) == set()
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="inotify is Linux only")
+def test_inotify_watcher_reports_closed_files(tmp_path: Path) -> None:
+    watcher = watch.InotifyWatcher(tmp_path, SUFFIXES)
+    try:
+        assert watcher.changes(0) == set()
+
+        image = tmp_path / "a.png"
+        image.write_bytes(b"a")
+        (tmp_path / "notes.txt").write_text("ignored")
+        assert watcher.changes(1) == {image}
+
+        nested = tmp_path / "sub"
+        nested.mkdir()
+        assert watcher.changes(1) == set()
+        (nested / "b.png").write_bytes(b"b")
+        assert watcher.changes(1) == {nested / "b.png"}
+    finally:
+        watcher.close()